@@ -1,6 +1,10 @@
 """Resume tailoring router."""
+import json
 import logging
+from typing import AsyncIterator
+
 from fastapi import APIRouter, HTTPException, status
+from fastapi.responses import StreamingResponse
 
 from src.models.job import TailorResumeRequest, TailorResumeResponse
 from src.services.resume_tailor import ResumeTailorService
@@ -10,8 +14,23 @@ router = APIRouter(prefix="/resume", tags=["resume"])
 logger = logging.getLogger(__name__)
 
 
+async def _sse_events(first_chunk: str, chunks: AsyncIterator[str]) -> AsyncIterator[str]:
+    """Frame tailoring response deltas as server-sent events."""
+    try:
+        if first_chunk:
+            yield f"data: {json.dumps(first_chunk)}\n\n"
+        async for chunk in chunks:
+            yield f"data: {json.dumps(chunk)}\n\n"
+    except OpenAIClientError as e:
+        logger.error(f"OpenAI API error while streaming: {e}")
+        error = {"error": "AI service temporarily unavailable", "message": str(e)}
+        yield f"event: error\ndata: {json.dumps(error)}\n\n"
+        return
+    yield "data: [DONE]\n\n"
+
+
 @router.post("/tailor", response_model=TailorResumeResponse)
-async def tailor_resume(request: TailorResumeRequest) -> TailorResumeResponse:
+async def tailor_resume(request: TailorResumeRequest, stream: bool = False):
     """Tailor a resume for a specific job description.
     
     This endpoint takes a resume and job description, then uses AI to:
@@ -21,11 +40,17 @@ async def tailor_resume(request: TailorResumeRequest) -> TailorResumeResponse:
     - Calculate a fit score (0-100)
     - Provide actionable improvement suggestions
     
+    With ``?stream=1`` the raw JSON tailoring response is instead streamed as
+    ``text/event-stream``: each event's data is a JSON-encoded text delta, and
+    the stream ends with ``data: [DONE]``.
+    
     Args:
         request: TailorResumeRequest containing resume, job_description, and options
+        stream: Stream the response as server-sent events
         
     Returns:
-        TailorResumeResponse with tailored content, suggestions, and metadata
+        TailorResumeResponse with tailored content, suggestions, and metadata,
+        or a StreamingResponse when streaming
         
     Raises:
         HTTPException: If tailoring fails due to API errors or invalid input
@@ -42,6 +67,20 @@ async def tailor_resume(request: TailorResumeRequest) -> TailorResumeResponse:
             }
         )
         
+        if stream:
+            chunks = service.tailor_resume_stream(
+                resume=request.resume,
+                job_description=request.job_description,
+                options=request.options,
+            )
+            # Pull the first delta before responding so failures to reach
+            # OpenAI still surface as an HTTP error status
+            first_chunk = await anext(chunks, "")
+            return StreamingResponse(
+                _sse_events(first_chunk, chunks),
+                media_type="text/event-stream",
+            )
+        
         response = await service.tailor_resume(
             resume=request.resume,
             job_description=request.job_description,
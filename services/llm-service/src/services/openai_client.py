@@ -1,15 +1,37 @@
 """OpenAI API client wrapper with retry logic and error handling."""
-import json
 import logging
-from typing import Optional
+import re
+from typing import Any, AsyncIterator, Optional
 import asyncio
 
+import orjson
 from openai import AsyncOpenAI, OpenAIError, RateLimitError, APIConnectionError, APITimeoutError
 
 from src.config import get_settings
 
 logger = logging.getLogger(__name__)
 
+# Markdown code fences models sometimes wrap JSON in, tried in this order
+_JSON_FENCE_RE = re.compile(r"```json\s*(.*?)```", re.DOTALL)
+_PLAIN_FENCE_RE = re.compile(r"```\s*(.*?)```", re.DOTALL)
+
+# Models that accept response_format={"type": "json_object"}. The bare
+# "gpt-3.5-turbo" alias resolves to a JSON-mode capable snapshot.
+_JSON_MODE_MODELS = ("gpt-3.5-turbo",)
+_JSON_MODE_MODEL_PREFIXES = (
+    "gpt-4o",
+    "gpt-4-turbo",
+    "gpt-4-1106",
+    "gpt-4-0125",
+    "gpt-3.5-turbo-1106",
+    "gpt-3.5-turbo-0125",
+)
+
+
+def supports_json_mode(model: str) -> bool:
+    """Return whether the model accepts the json_object response format."""
+    return model in _JSON_MODE_MODELS or model.startswith(_JSON_MODE_MODEL_PREFIXES)
+
 
 class OpenAIClientError(Exception):
     """Custom exception for OpenAI client errors."""
@@ -39,52 +61,39 @@ class OpenAIClient:
         
         self._client = AsyncOpenAI(api_key=self.api_key)
     
-    async def _make_request_with_retry(
+    def _request_kwargs(
         self,
         messages: list,
         model: Optional[str] = None,
         max_tokens: Optional[int] = None,
         temperature: Optional[float] = None,
         response_format: Optional[dict] = None,
-    ) -> tuple[str, int]:
-        """Make a request to OpenAI with retry logic.
+    ) -> dict:
+        """Build chat.completions.create arguments, applying client defaults."""
+        kwargs = {
+            "model": model or self.model,
+            "messages": messages,
+            "max_tokens": max_tokens or self.max_tokens,
+            "temperature": temperature or self.temperature,
+        }
+        
+        if response_format:
+            kwargs["response_format"] = response_format
+        
+        return kwargs
+    
+    async def _create_with_retry(self, kwargs: dict) -> tuple[Any, int]:
+        """Call chat.completions.create, retrying transient errors with backoff.
         
         Returns:
-            Tuple of (response_content, tokens_used)
+            Tuple of (raw response or stream, attempt number that succeeded)
         """
-        model = model or self.model
-        max_tokens = max_tokens or self.max_tokens
-        temperature = temperature or self.temperature
-        
         last_exception = None
         
         for attempt in range(self.max_retries):
             try:
-                kwargs = {
-                    "model": model,
-                    "messages": messages,
-                    "max_tokens": max_tokens,
-                    "temperature": temperature,
-                }
-                
-                if response_format:
-                    kwargs["response_format"] = response_format
-                
                 response = await self._client.chat.completions.create(**kwargs)
-                
-                content = response.choices[0].message.content
-                tokens_used = response.usage.total_tokens if response.usage else 0
-                
-                logger.info(
-                    "OpenAI request successful",
-                    extra={
-                        "model": model,
-                        "tokens_used": tokens_used,
-                        "attempt": attempt + 1,
-                    }
-                )
-                
-                return content, tokens_used
+                return response, attempt + 1
                 
             except RateLimitError as e:
                 last_exception = e
@@ -126,6 +135,36 @@ class OpenAIClient:
             f"Failed after {self.max_retries} retries: {last_exception}"
         ) from last_exception
     
+    async def _make_request_with_retry(
+        self,
+        messages: list,
+        model: Optional[str] = None,
+        max_tokens: Optional[int] = None,
+        temperature: Optional[float] = None,
+        response_format: Optional[dict] = None,
+    ) -> tuple[str, int]:
+        """Make a request to OpenAI with retry logic.
+        
+        Returns:
+            Tuple of (response_content, tokens_used)
+        """
+        kwargs = self._request_kwargs(messages, model, max_tokens, temperature, response_format)
+        response, attempt = await self._create_with_retry(kwargs)
+        
+        content = response.choices[0].message.content
+        tokens_used = response.usage.total_tokens if response.usage else 0
+        
+        logger.info(
+            "OpenAI request successful",
+            extra={
+                "model": kwargs["model"],
+                "tokens_used": tokens_used,
+                "attempt": attempt,
+            }
+        )
+        
+        return content, tokens_used
+    
     async def chat_completion(
         self,
         system_prompt: str,
@@ -143,44 +182,98 @@ class OpenAIClient:
             model: Model override
             max_tokens: Max tokens override
             temperature: Temperature override
-            json_response: Whether to request JSON response format (requires gpt-4-1106-preview or later)
+            json_response: Whether to request JSON response format (only sent to models
+                that support JSON mode)
             
         Returns:
             Tuple of (response_content, tokens_used)
         """
-        messages = [
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": user_prompt},
-        ]
-        
-        # response_format with json_object is supported in OpenAI API v1.1+
-        # and requires models like gpt-4-1106-preview, gpt-4-turbo, or gpt-3.5-turbo-1106
-        response_format = {"type": "json_object"} if json_response else None
-        
         return await self._make_request_with_retry(
-            messages=messages,
+            messages=self._build_messages(system_prompt, user_prompt),
             model=model,
             max_tokens=max_tokens,
             temperature=temperature,
-            response_format=response_format,
+            response_format=self._response_format(json_response, model),
         )
     
+    async def chat_completion_stream(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        model: Optional[str] = None,
+        max_tokens: Optional[int] = None,
+        temperature: Optional[float] = None,
+        json_response: bool = False,
+    ) -> AsyncIterator[str]:
+        """Stream a chat completion, yielding content deltas as they arrive.
+        
+        Retries apply to opening the stream only; an error after tokens have
+        started flowing is raised as OpenAIClientError. The upstream response
+        is closed however iteration ends, including when the consumer stops
+        early (e.g. the SSE client disconnects), so OpenAI stops generating.
+        
+        Args:
+            Same as chat_completion.
+            
+        Yields:
+            Non-empty content deltas in generation order
+        """
+        kwargs = self._request_kwargs(
+            self._build_messages(system_prompt, user_prompt),
+            model,
+            max_tokens,
+            temperature,
+            self._response_format(json_response, model),
+        )
+        kwargs["stream"] = True
+        
+        stream, attempt = await self._create_with_retry(kwargs)
+        logger.info(
+            "OpenAI stream opened",
+            extra={"model": kwargs["model"], "attempt": attempt}
+        )
+        
+        try:
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    yield delta
+        except OpenAIError as e:
+            logger.error(f"OpenAI stream interrupted: {e}")
+            raise OpenAIClientError(f"OpenAI stream interrupted: {e}") from e
+        finally:
+            await stream.response.aclose()
+    
+    @staticmethod
+    def _build_messages(system_prompt: str, user_prompt: str) -> list:
+        """Build the system + user message list for a completion."""
+        return [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt},
+        ]
+    
+    def _response_format(self, json_response: bool, model: Optional[str] = None) -> Optional[dict]:
+        """Return the response_format argument for a request, if any."""
+        # response_format with json_object is supported in OpenAI API v1.1+
+        # and requires models like gpt-4-1106-preview, gpt-4-turbo, or gpt-3.5-turbo-1106.
+        # Older models reject it, so they rely on the prompt asking for JSON and
+        # parse_json_response stripping any markdown around it.
+        if json_response and supports_json_mode(model or self.model):
+            return {"type": "json_object"}
+        return None
+    
     async def parse_json_response(self, response: str) -> dict:
         """Parse JSON from response, handling potential formatting issues."""
         try:
-            return json.loads(response)
-        except json.JSONDecodeError:
+            return orjson.loads(response)
+        except orjson.JSONDecodeError:
             # Try to extract JSON from markdown code blocks
-            if "```json" in response:
-                start = response.find("```json") + 7
-                end = response.find("```", start)
-                if end != -1:
-                    json_str = response[start:end].strip()
-                    return json.loads(json_str)
-            elif "```" in response:
-                start = response.find("```") + 3
-                end = response.find("```", start)
-                if end != -1:
-                    json_str = response[start:end].strip()
-                    return json.loads(json_str)
+            match = _JSON_FENCE_RE.search(response) or _PLAIN_FENCE_RE.search(response)
+            if match:
+                try:
+                    return orjson.loads(match.group(1).strip())
+                except orjson.JSONDecodeError:
+                    pass
             raise OpenAIClientError(f"Failed to parse JSON response: {response[:200]}")
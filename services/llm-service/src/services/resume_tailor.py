@@ -1,7 +1,10 @@
 """Resume tailoring service using OpenAI."""
+import asyncio
+import functools
+import hashlib
 import logging
 import re
-from typing import Optional
+from typing import AsyncIterator, Optional
 
 from src.models.resume import Resume
 from src.models.job import (
@@ -21,6 +24,39 @@ from src.services.prompt_templates import (
 
 logger = logging.getLogger(__name__)
 
+# Maximal runs of word characters. An alphabetic word matches r"\bword\b" in a
+# text exactly when it is one of these runs.
+_WORD_RE = re.compile(r"\w+")
+
+# Tailoring calls currently awaiting OpenAI, keyed by _request_key(). Identical
+# concurrent requests await the same task instead of each paying for a call.
+_inflight_requests: dict[tuple[str, str, str], asyncio.Task] = {}
+
+
+def _forget_inflight(key: tuple[str, str, str], task: asyncio.Task) -> None:
+    """Done-callback removing a finished tailoring task from _inflight_requests.
+    
+    The task's exception, if any, is retrieved here: when every caller awaiting
+    the task was cancelled, nothing else would, and asyncio would log "Task
+    exception was never retrieved". Callers still awaiting it get it as usual.
+    """
+    _inflight_requests.pop(key, None)
+    if not task.cancelled():
+        task.exception()
+
+
+def _request_key(
+    resume: Resume,
+    job_description: JobDescription,
+    options: TailoringOptions,
+) -> tuple[str, str, str]:
+    """Content hash identifying a (resume, job, options) tailoring request."""
+    return (
+        hashlib.sha256(resume.model_dump_json().encode()).hexdigest(),
+        hashlib.sha256(job_description.model_dump_json().encode()).hexdigest(),
+        options.model_dump_json(),
+    )
+
 
 class ResumeTailorService:
     """Service for tailoring resumes to job descriptions."""
@@ -41,11 +77,41 @@ class ResumeTailorService:
             job_description: Target job description
             options: Tailoring options
             
+        Identical requests that arrive while one is already in flight share its
+        result rather than making another OpenAI call.
+        
         Returns:
             TailorResumeResponse with tailored content and suggestions
         """
         options = options or TailoringOptions()
+        key = _request_key(resume, job_description, options)
         
+        task = _inflight_requests.get(key)
+        if task is not None:
+            logger.info(
+                "Coalescing duplicate tailoring request",
+                extra={
+                    "target_company": job_description.company,
+                    "target_role": job_description.title,
+                }
+            )
+        else:
+            task = asyncio.ensure_future(
+                self._tailor_resume(resume, job_description, options)
+            )
+            _inflight_requests[key] = task
+            task.add_done_callback(functools.partial(_forget_inflight, key))
+        
+        # Shield so one caller disconnecting does not cancel the shared call
+        return await asyncio.shield(task)
+    
+    async def _tailor_resume(
+        self,
+        resume: Resume,
+        job_description: JobDescription,
+        options: TailoringOptions,
+    ) -> TailorResumeResponse:
+        """Run a single tailoring request against OpenAI."""
         logger.info(
             "Starting resume tailoring",
             extra={
@@ -56,22 +122,7 @@ class ResumeTailorService:
             }
         )
         
-        # Format inputs for the prompt
-        resume_dict = resume.model_dump()
-        resume_text = format_resume_for_prompt(resume_dict)
-        company, title, description, requirements, preferred = format_job_for_prompt(
-            job_description.model_dump()
-        )
-        
-        # Build the user prompt
-        user_prompt = RESUME_TAILOR_USER_PROMPT.format(
-            resume_json=resume_text,
-            company=company,
-            job_title=title,
-            job_description=description,
-            requirements=requirements,
-            preferred=preferred,
-        )
+        user_prompt = self._build_user_prompt(resume, job_description)
         
         try:
             # Call OpenAI
@@ -136,6 +187,62 @@ class ResumeTailorService:
             logger.error(f"Unexpected error during tailoring: {e}")
             raise OpenAIClientError(f"Failed to tailor resume: {e}") from e
     
+    async def tailor_resume_stream(
+        self,
+        resume: Resume,
+        job_description: JobDescription,
+        options: Optional[TailoringOptions] = None,
+    ) -> AsyncIterator[str]:
+        """Stream the raw tailoring response as it is generated.
+        
+        Yields the model's JSON output in content deltas; callers that need a
+        TailorResumeResponse should accumulate the deltas and parse them, or
+        use tailor_resume instead.
+        
+        Args:
+            resume: Original resume
+            job_description: Target job description
+            options: Tailoring options
+            
+        Yields:
+            Content deltas of the JSON tailoring response
+        """
+        options = options or TailoringOptions()
+        
+        logger.info(
+            "Starting streamed resume tailoring",
+            extra={
+                "candidate": resume.name,
+                "target_company": job_description.company,
+                "target_role": job_description.title,
+                "model": options.model,
+            }
+        )
+        
+        async for delta in self.openai_client.chat_completion_stream(
+            system_prompt=RESUME_TAILOR_SYSTEM_PROMPT,
+            user_prompt=self._build_user_prompt(resume, job_description),
+            model=options.model,
+            json_response=True,
+        ):
+            yield delta
+    
+    def _build_user_prompt(self, resume: Resume, job_description: JobDescription) -> str:
+        """Format the resume and job description into the tailoring user prompt."""
+        resume_text = format_resume_for_prompt(resume.model_dump())
+        company, title, description, requirements, preferred = format_job_for_prompt(
+            job_description.model_dump()
+        )
+        
+        return RESUME_TAILOR_USER_PROMPT.format(
+            resume_json=resume_text,
+            company=company,
+            job_title=title,
+            job_description=description,
+            requirements=requirements,
+            preferred=preferred,
+        )
+    
     def calculate_fit_score(
         self,
         resume: Resume,
@@ -217,14 +324,12 @@ class ResumeTailorService:
         ]).lower()
         
         # Extract important keywords (words > 4 chars that appear in both)
-        # Use word boundary matching to avoid false positives from substring matches
+        # Match whole words only to avoid false positives from substring matches:
+        # tokenize the resume once and test membership instead of running a
+        # word-boundary regex over the whole resume for every job word
         job_words = set(word.strip(".,!?;:()[]{}") for word in job_text.split() if len(word) > 4)
-        matched = []
-        
-        for word in job_words:
-            # Use word boundary regex to match whole words only
-            if word.isalpha() and re.search(r'\b' + re.escape(word) + r'\b', resume_text):
-                matched.append(word)
+        resume_words = set(_WORD_RE.findall(resume_text))
+        matched = [word for word in job_words if word.isalpha() and word in resume_words]
         
         # Return unique keywords, sorted by length (longer = more specific)
         return sorted(list(set(matched)), key=len, reverse=True)[:20]
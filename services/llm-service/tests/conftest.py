@@ -1,12 +1,155 @@
 """Pytest fixtures for LLM Service tests."""
+import copy
+import json
+from types import SimpleNamespace
+
 import pytest
-from unittest.mock import AsyncMock, patch
+from unittest.mock import patch
 from fastapi.testclient import TestClient
 
 from src.models.resume import Resume, Experience, Education
 from src.models.job import JobDescription, TailoringOptions
 
 
+SOFTWARE_ENGINEER_RESPONSE = {
+    "tailored_resume": {
+        "summary": "Results-driven Staff Software Engineer with 8+ years of experience building and scaling distributed systems. Proven track record of leading cross-functional teams and mentoring engineers to deliver high-impact solutions.",
+        "experience": [
+            {
+                "title": "Senior Software Engineer",
+                "company": "TechCorp Inc",
+                "start_date": "2020-01",
+                "end_date": None,
+                "description": "Lead architect for microservices platform serving 10M+ users, directly aligned with Staff Engineer responsibilities in designing scalable systems.",
+                "highlights": [
+                    "Reduced API latency by 40% through strategic caching optimization, demonstrating expertise in performance tuning",
+                    "Mentored team of 5 engineers, fostering technical growth and code quality improvements",
+                    "Designed and implemented CI/CD pipelines reducing deployment time by 60%"
+                ]
+            }
+        ],
+        "skills_highlighted": ["Python", "TypeScript", "AWS", "Kubernetes", "Docker"],
+        "keywords_matched": ["scalable systems", "mentoring", "cloud platforms", "leadership"],
+        "fit_score": 87
+    },
+    "suggestions": [
+        "Consider adding specific metrics for your AWS infrastructure projects to match cloud platform requirements",
+        "Highlight any distributed systems work more prominently to match the preferred qualifications",
+        "Emphasize the leadership aspect of your current role to align with the Staff level expectations"
+    ]
+}
+
+ML_ENGINEER_RESPONSE = {
+    "tailored_resume": {
+        "summary": "Software engineer with 8 years of Python experience and a growing focus on production machine learning systems.",
+        "experience": [],
+        "skills_highlighted": ["Python", "AWS", "Docker"],
+        "keywords_matched": ["python", "production"],
+        "fit_score": 62
+    },
+    "suggestions": [
+        "Add any model training or MLOps projects to strengthen the machine learning profile"
+    ]
+}
+
+SRE_RESPONSE = {
+    "tailored_resume": {
+        "summary": "Reliability-minded engineer who reduced API latency by 40% and built CI/CD pipelines on Kubernetes and AWS.",
+        "experience": [],
+        "skills_highlighted": ["Kubernetes", "AWS", "Docker"],
+        "keywords_matched": ["kubernetes", "latency", "ci/cd"],
+        "fit_score": 74
+    },
+    "suggestions": [
+        "Quantify uptime or incident-response improvements",
+        "Mention on-call experience if applicable"
+    ]
+}
+
+# (prompt substring, response body, total_tokens) answered by FakeAsyncOpenAI
+CANNED_RESPONSES = [
+    ("Title: Staff Software Engineer", SOFTWARE_ENGINEER_RESPONSE, 1250),
+    ("Title: Machine Learning Engineer", ML_ENGINEER_RESPONSE, 980),
+    ("Title: Site Reliability Engineer", SRE_RESPONSE, 1100),
+]
+DEFAULT_CANNED_CONTENT = '{"result": "test"}'
+DEFAULT_CANNED_TOKENS = 100
+
+
+class FakeAsyncOpenAI:
+    """In-process stand-in for ``openai.AsyncOpenAI``.
+
+    Chat completions are answered from CANNED_RESPONSES by matching a
+    substring of the request messages, in chunks when ``stream=True``.
+    Exceptions queued on ``errors`` are raised first, one per call, to
+    exercise retry paths. Returned streams are kept in ``streams``.
+    """
+
+    def __init__(self, api_key=None, **kwargs):
+        self.api_key = api_key
+        self.calls = []
+        self.errors = []
+        self.streams = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    async def _create(self, **kwargs):
+        self.calls.append(kwargs)
+        if self.errors:
+            raise self.errors.pop(0)
+
+        prompt = "\n".join(message["content"] for message in kwargs["messages"])
+        content, tokens = DEFAULT_CANNED_CONTENT, DEFAULT_CANNED_TOKENS
+        for needle, response, total_tokens in CANNED_RESPONSES:
+            if needle in prompt:
+                content, tokens = json.dumps(response), total_tokens
+                break
+
+        if kwargs.get("stream"):
+            stream = FakeAsyncStream(content)
+            self.streams.append(stream)
+            return stream
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+            usage=SimpleNamespace(total_tokens=tokens),
+        )
+
+
+
+class FakeAsyncStream:
+    """In-process stand-in for ``openai.AsyncStream``.
+
+    Yields ``content`` in chunks; ``response.closed`` records whether the
+    underlying HTTP response was closed.
+    """
+
+    def __init__(self, content, chunk_size=16):
+        self.content = content
+        self.chunk_size = chunk_size
+        self.response = FakeStreamResponse()
+
+    async def __aiter__(self):
+        for start in range(0, len(self.content), self.chunk_size):
+            delta = SimpleNamespace(content=self.content[start:start + self.chunk_size])
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=delta)])
+
+
+class FakeStreamResponse:
+    """HTTP response of a FakeAsyncStream."""
+
+    def __init__(self):
+        self.closed = False
+
+    async def aclose(self):
+        self.closed = True
+
+
+@pytest.fixture(scope="session", autouse=True)
+def fake_openai():
+    """Route every AsyncOpenAI construction to the in-process fake."""
+    with patch('src.services.openai_client.AsyncOpenAI', FakeAsyncOpenAI):
+        yield FakeAsyncOpenAI
+
+
 @pytest.fixture
 def sample_resume():
     """Create a sample resume for testing."""
@@ -97,50 +240,19 @@ def sample_tailoring_options():
 
 @pytest.fixture
 def mock_openai_response():
-    """Create a mock OpenAI response for testing."""
-    return {
-        "tailored_resume": {
-            "summary": "Results-driven Staff Software Engineer with 8+ years of experience building and scaling distributed systems. Proven track record of leading cross-functional teams and mentoring engineers to deliver high-impact solutions.",
-            "experience": [
-                {
-                    "title": "Senior Software Engineer",
-                    "company": "TechCorp Inc",
-                    "start_date": "2020-01",
-                    "end_date": None,
-                    "description": "Lead architect for microservices platform serving 10M+ users, directly aligned with Staff Engineer responsibilities in designing scalable systems.",
-                    "highlights": [
-                        "Reduced API latency by 40% through strategic caching optimization, demonstrating expertise in performance tuning",
-                        "Mentored team of 5 engineers, fostering technical growth and code quality improvements",
-                        "Designed and implemented CI/CD pipelines reducing deployment time by 60%"
-                    ]
-                }
-            ],
-            "skills_highlighted": ["Python", "TypeScript", "AWS", "Kubernetes", "Docker"],
-            "keywords_matched": ["scalable systems", "mentoring", "cloud platforms", "leadership"],
-            "fit_score": 87
-        },
-        "suggestions": [
-            "Consider adding specific metrics for your AWS infrastructure projects to match cloud platform requirements",
-            "Highlight any distributed systems work more prominently to match the preferred qualifications",
-            "Emphasize the leadership aspect of your current role to align with the Staff level expectations"
-        ]
-    }
-
-
-@pytest.fixture
-def mock_openai_client():
-    """Create a mock OpenAI client for testing."""
-    with patch('src.services.openai_client.AsyncOpenAI') as mock:
-        client = AsyncMock()
-        mock.return_value = client
-        yield client
+    """Canned OpenAI response for the Staff Software Engineer sample job."""
+    return copy.deepcopy(SOFTWARE_ENGINEER_RESPONSE)
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def test_client():
-    """Create a test client for the FastAPI application."""
+    """Create a test client for the FastAPI application.
+
+    Module-scoped so the app (routers, middleware) is built once and shared
+    by every endpoint test in a module instead of once per test.
+    """
     import os
-    # Set required environment variable for testing
+    # Set required environment variables once for the whole module
     with patch.dict(os.environ, {
         'OPENAI_API_KEY': 'test-api-key',
         'ALLOWED_HOSTS': 'localhost,127.0.0.1,testserver,llm-service'
@@ -153,5 +265,5 @@ def test_client():
         client = TestClient(app)
         yield client
         
-        # Clear cache after test
+        # Clear cache after the module's tests
         get_settings.cache_clear()
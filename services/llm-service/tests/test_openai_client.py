@@ -1,8 +1,10 @@
 """Tests for OpenAI client wrapper."""
+import json
+
 import pytest
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import MagicMock, patch
 
-from src.services.openai_client import OpenAIClient, OpenAIClientError
+from src.services.openai_client import OpenAIClient, OpenAIClientError, supports_json_mode
 
 
 class TestOpenAIClient:
@@ -22,12 +24,6 @@ class TestOpenAIClient:
             mock.return_value = settings
             yield settings
 
-    @pytest.fixture
-    def mock_async_openai(self):
-        """Mock the AsyncOpenAI client."""
-        with patch('src.services.openai_client.AsyncOpenAI') as mock:
-            yield mock
-
     def test_init_without_api_key_raises_error(self, mock_settings):
         """Test that initialization fails without API key."""
         mock_settings.openai_api_key = ""
@@ -35,7 +31,7 @@ class TestOpenAIClient:
         with pytest.raises(OpenAIClientError, match="API key is required"):
             OpenAIClient()
 
-    def test_init_with_api_key_succeeds(self, mock_settings, mock_async_openai):
+    def test_init_with_api_key_succeeds(self, mock_settings):
         """Test that initialization succeeds with API key."""
         client = OpenAIClient()
         
@@ -44,7 +40,7 @@ class TestOpenAIClient:
         assert client.max_tokens == 2000
         assert client.temperature == 0.7
 
-    def test_init_with_override_values(self, mock_settings, mock_async_openai):
+    def test_init_with_override_values(self, mock_settings):
         """Test that init accepts override values."""
         client = OpenAIClient(
             api_key="custom-key",
@@ -59,18 +55,8 @@ class TestOpenAIClient:
         assert client.temperature == 0.5
 
     @pytest.mark.asyncio
-    async def test_chat_completion_success(self, mock_settings, mock_async_openai):
+    async def test_chat_completion_success(self, mock_settings):
         """Test successful chat completion."""
-        # Setup mock response
-        mock_response = MagicMock()
-        mock_response.choices = [MagicMock()]
-        mock_response.choices[0].message.content = '{"result": "test"}'
-        mock_response.usage.total_tokens = 100
-        
-        mock_client = AsyncMock()
-        mock_client.chat.completions.create.return_value = mock_response
-        mock_async_openai.return_value = mock_client
-        
         client = OpenAIClient()
         content, tokens = await client.chat_completion(
             system_prompt="You are a helpful assistant.",
@@ -81,44 +67,93 @@ class TestOpenAIClient:
         assert tokens == 100
         
         # Verify the call was made with correct parameters
-        mock_client.chat.completions.create.assert_called_once()
-        call_kwargs = mock_client.chat.completions.create.call_args[1]
+        assert len(client._client.calls) == 1
+        call_kwargs = client._client.calls[0]
         assert call_kwargs["model"] == "gpt-4"
         assert len(call_kwargs["messages"]) == 2
         assert call_kwargs["messages"][0]["role"] == "system"
         assert call_kwargs["messages"][1]["role"] == "user"
 
     @pytest.mark.asyncio
-    async def test_chat_completion_with_json_response(self, mock_settings, mock_async_openai):
+    async def test_chat_completion_with_json_response(self, mock_settings):
         """Test chat completion with JSON response format."""
-        mock_response = MagicMock()
-        mock_response.choices = [MagicMock()]
-        mock_response.choices[0].message.content = '{"result": "json"}'
-        mock_response.usage.total_tokens = 50
-        
-        mock_client = AsyncMock()
-        mock_client.chat.completions.create.return_value = mock_response
-        mock_async_openai.return_value = mock_client
-        
         client = OpenAIClient()
         await client.chat_completion(
             system_prompt="System",
-            user_prompt="User",
+            user_prompt="Return JSON",
+            model="gpt-4o",
             json_response=True
         )
         
-        call_kwargs = mock_client.chat.completions.create.call_args[1]
+        call_kwargs = client._client.calls[0]
         assert call_kwargs["response_format"] == {"type": "json_object"}
 
     @pytest.mark.asyncio
-    async def test_parse_json_response_valid(self, mock_settings, mock_async_openai):
+    async def test_chat_completion_json_response_unsupported_model(self, mock_settings):
+        """Test that models without JSON mode are not sent response_format."""
+        client = OpenAIClient()
+        await client.chat_completion(
+            system_prompt="System",
+            user_prompt="Return JSON",
+            json_response=True
+        )
+        
+        call_kwargs = client._client.calls[0]
+        assert call_kwargs["model"] == "gpt-4"
+        assert "response_format" not in call_kwargs
+
+    @pytest.mark.asyncio
+    async def test_chat_completion_stream_yields_deltas(self, mock_settings):
+        """Test that streamed deltas reassemble into the full completion."""
+        client = OpenAIClient()
+        
+        deltas = [
+            delta async for delta in client.chat_completion_stream(
+                system_prompt="System",
+                user_prompt="Title: Staff Software Engineer"
+            )
+        ]
+        
+        assert len(deltas) > 1
+        assert json.loads("".join(deltas))["tailored_resume"]["fit_score"] == 87
+        assert client._client.calls[0]["stream"] is True
+        assert client._client.streams[0].response.closed
+
+    @pytest.mark.asyncio
+    async def test_chat_completion_stream_closes_response_when_abandoned(self, mock_settings):
+        """Test that the upstream response is closed when the consumer stops early."""
+        client = OpenAIClient()
+        deltas = client.chat_completion_stream(
+            system_prompt="System",
+            user_prompt="Title: Staff Software Engineer"
+        )
+        
+        await anext(deltas)
+        assert not client._client.streams[0].response.closed
+        await deltas.aclose()
+        
+        assert client._client.streams[0].response.closed
+
+    @pytest.mark.parametrize("model,expected", [
+        ("gpt-4o", True),
+        ("gpt-4-turbo-preview", True),
+        ("gpt-3.5-turbo", True),
+        ("gpt-4", False),
+        ("gpt-3.5-turbo-16k", False),
+    ])
+    def test_supports_json_mode(self, model, expected):
+        """Test JSON mode detection for the allowed models."""
+        assert supports_json_mode(model) is expected
+
+    @pytest.mark.asyncio
+    async def test_parse_json_response_valid(self, mock_settings):
         """Test parsing valid JSON response."""
         client = OpenAIClient()
         result = await client.parse_json_response('{"key": "value"}')
         assert result == {"key": "value"}
 
     @pytest.mark.asyncio
-    async def test_parse_json_response_with_markdown(self, mock_settings, mock_async_openai):
+    async def test_parse_json_response_with_markdown(self, mock_settings):
         """Test parsing JSON wrapped in markdown code blocks."""
         client = OpenAIClient()
         
@@ -133,7 +168,24 @@ class TestOpenAIClient:
         assert result == {"key": "value2"}
 
     @pytest.mark.asyncio
-    async def test_parse_json_response_invalid_raises_error(self, mock_settings, mock_async_openai):
+    async def test_parse_json_response_prefers_json_fence(self, mock_settings):
+        """Test that a ```json block wins over an earlier plain block."""
+        client = OpenAIClient()
+        
+        response = 'Example:\n```\nnot json\n```\nAnswer:\n```json\n{"key": "value"}\n```'
+        result = await client.parse_json_response(response)
+        assert result == {"key": "value"}
+
+    @pytest.mark.asyncio
+    async def test_parse_json_response_invalid_fenced_raises_error(self, mock_settings):
+        """Test that invalid JSON inside a code block raises a client error."""
+        client = OpenAIClient()
+        
+        with pytest.raises(OpenAIClientError, match="Failed to parse JSON"):
+            await client.parse_json_response("```json\n{not json}\n```")
+
+    @pytest.mark.asyncio
+    async def test_parse_json_response_invalid_raises_error(self, mock_settings):
         """Test that invalid JSON raises error."""
         client = OpenAIClient()
         
@@ -141,46 +193,36 @@ class TestOpenAIClient:
             await client.parse_json_response("not valid json")
 
     @pytest.mark.asyncio
-    async def test_retry_on_rate_limit(self, mock_settings, mock_async_openai):
+    async def test_retry_on_rate_limit(self, mock_settings):
         """Test that rate limit errors trigger retry."""
         from openai import RateLimitError
         
-        mock_response = MagicMock()
-        mock_response.choices = [MagicMock()]
-        mock_response.choices[0].message.content = "success"
-        mock_response.usage.total_tokens = 50
-        
-        mock_client = AsyncMock()
+        client = OpenAIClient()
         # First two calls fail, third succeeds
-        mock_client.chat.completions.create.side_effect = [
+        client._client.errors.extend([
             RateLimitError("Rate limit exceeded", response=MagicMock(), body={}),
             RateLimitError("Rate limit exceeded", response=MagicMock(), body={}),
-            mock_response
-        ]
-        mock_async_openai.return_value = mock_client
+        ])
         
-        client = OpenAIClient()
         content, tokens = await client.chat_completion(
             system_prompt="System",
             user_prompt="User"
         )
         
-        assert content == "success"
-        assert mock_client.chat.completions.create.call_count == 3
+        assert content == '{"result": "test"}'
+        assert len(client._client.calls) == 3
 
     @pytest.mark.asyncio
-    async def test_retry_exhausted_raises_error(self, mock_settings, mock_async_openai):
+    async def test_retry_exhausted_raises_error(self, mock_settings):
         """Test that exhausted retries raise error."""
         from openai import RateLimitError
         
-        mock_client = AsyncMock()
+        client = OpenAIClient()
         # All calls fail
-        mock_client.chat.completions.create.side_effect = RateLimitError(
-            "Rate limit exceeded", response=MagicMock(), body={}
+        client._client.errors.extend(
+            RateLimitError("Rate limit exceeded", response=MagicMock(), body={})
+            for _ in range(mock_settings.max_retries)
         )
-        mock_async_openai.return_value = mock_client
-        
-        client = OpenAIClient()
         
         with pytest.raises(OpenAIClientError, match="Failed after 3 retries"):
             await client.chat_completion(
@@ -1,11 +1,22 @@
 """Tests for resume tailoring service."""
+import asyncio
+import gc
+
 import pytest
 from unittest.mock import AsyncMock, patch
 import json
 
 from src.services.resume_tailor import ResumeTailorService
-from src.services.openai_client import OpenAIClientError
-from src.models.job import TailoringOptions
+from src.services.openai_client import OpenAIClient, OpenAIClientError
+from src.models.job import JobDescription, TailoringOptions
+
+
+def _mock_client_returning(body: dict, tokens: int = 100) -> AsyncMock:
+    """Create a mock OpenAI client whose completion returns ``body``."""
+    client = AsyncMock()
+    client.chat_completion.return_value = (json.dumps(body), tokens)
+    client.parse_json_response.return_value = body
+    return client
 
 
 class TestResumeTailorService:
@@ -14,10 +25,7 @@ class TestResumeTailorService:
     @pytest.fixture
     def mock_openai_client(self, mock_openai_response):
         """Create a mock OpenAI client."""
-        client = AsyncMock()
-        client.chat_completion.return_value = (json.dumps(mock_openai_response), 1250)
-        client.parse_json_response.return_value = mock_openai_response
-        return client
+        return _mock_client_returning(mock_openai_response, tokens=1250)
 
     @pytest.mark.asyncio
     async def test_tailor_resume_success(
@@ -82,60 +90,134 @@ class TestResumeTailorService:
             )
 
     @pytest.mark.asyncio
+    @pytest.mark.parametrize("raw_score,expected_score", [
+        (150, 100),
+        (-25, 0),
+        (87, 87),
+    ])
     async def test_tailor_resume_fit_score_bounds(
         self,
         sample_resume,
-        sample_job_description
+        sample_job_description,
+        raw_score,
+        expected_score
     ):
         """Test that fit score is clamped to 0-100."""
-        mock_client = AsyncMock()
-        
-        # Test with score > 100
-        response_over = {
+        mock_client = _mock_client_returning({
             "tailored_resume": {
                 "summary": "Test summary",
                 "experience": [],
                 "skills_highlighted": [],
                 "keywords_matched": [],
-                "fit_score": 150
+                "fit_score": raw_score
             },
             "suggestions": []
-        }
-        mock_client.chat_completion.return_value = (json.dumps(response_over), 100)
-        mock_client.parse_json_response.return_value = response_over
+        })
         
         service = ResumeTailorService(openai_client=mock_client)
         result = await service.tailor_resume(sample_resume, sample_job_description)
         
-        assert result.tailored_resume.fit_score == 100
+        assert result.tailored_resume.fit_score == expected_score
 
     @pytest.mark.asyncio
-    async def test_tailor_resume_fit_score_lower_bound(
+    @pytest.mark.parametrize("job_title,model,expected_fit_score,expected_tokens", [
+        ("Staff Software Engineer", "gpt-4", 87, 1250),
+        ("Machine Learning Engineer", "gpt-3.5-turbo", 62, 980),
+        ("Site Reliability Engineer", "gpt-4o", 74, 1100),
+    ])
+    async def test_tailor_resume_samples(
+        self,
+        sample_resume,
+        sample_job_description,
+        job_title,
+        model,
+        expected_fit_score,
+        expected_tokens
+    ):
+        """Test tailoring end to end against the in-process fake OpenAI."""
+        service = ResumeTailorService(openai_client=OpenAIClient(api_key="test-api-key"))
+        job = sample_job_description.model_copy(update={"title": job_title})
+        
+        response = await service.tailor_resume(
+            sample_resume, job, options=TailoringOptions(model=model)
+        )
+        
+        assert response.tailored_resume.fit_score == expected_fit_score
+        assert response.tokens_used == expected_tokens
+        assert response.model == model
+
+    @pytest.mark.asyncio
+    async def test_tailor_resume_coalesces_concurrent_duplicates(
+        self,
+        sample_resume,
+        sample_job_description,
+        mock_openai_response
+    ):
+        """Test that identical concurrent requests share one OpenAI call."""
+        mock_client = _mock_client_returning(mock_openai_response, tokens=1250)
+        
+        async def slow_completion(**kwargs):
+            await asyncio.sleep(0.01)
+            return json.dumps(mock_openai_response), 1250
+        
+        mock_client.chat_completion.side_effect = slow_completion
+        service = ResumeTailorService(openai_client=mock_client)
+        other_job = sample_job_description.model_copy(update={"company": "OtherCo"})
+        
+        first, duplicate, other = await asyncio.gather(
+            service.tailor_resume(sample_resume, sample_job_description),
+            service.tailor_resume(sample_resume, sample_job_description),
+            service.tailor_resume(sample_resume, other_job),
+        )
+        
+        assert mock_client.chat_completion.call_count == 2
+        assert duplicate == first
+        assert other.tailored_resume.fit_score == 87
+        
+        # Once finished, the same request is sent again
+        await service.tailor_resume(sample_resume, sample_job_description)
+        assert mock_client.chat_completion.call_count == 3
+
+    @pytest.mark.asyncio
+    async def test_tailor_resume_failure_after_all_callers_cancelled_is_retrieved(
         self,
         sample_resume,
         sample_job_description
     ):
-        """Test that negative fit score is clamped to 0."""
+        """Test that a shared call failing after its callers were cancelled is not reported as unretrieved."""
         mock_client = AsyncMock()
+        failed = asyncio.Event()
         
-        # Test with score < 0
-        response_under = {
-            "tailored_resume": {
-                "summary": "Test summary",
-                "experience": [],
-                "skills_highlighted": [],
-                "keywords_matched": [],
-                "fit_score": -25
-            },
-            "suggestions": []
-        }
-        mock_client.chat_completion.return_value = (json.dumps(response_under), 100)
-        mock_client.parse_json_response.return_value = response_under
+        async def failing_completion(**kwargs):
+            await asyncio.sleep(0.01)
+            failed.set()
+            raise OpenAIClientError("API Error")
         
+        mock_client.chat_completion.side_effect = failing_completion
         service = ResumeTailorService(openai_client=mock_client)
-        result = await service.tailor_resume(sample_resume, sample_job_description)
+        loop = asyncio.get_running_loop()
+        unhandled = []
+        loop.set_exception_handler(lambda _, context: unhandled.append(context))
+        
+        try:
+            callers = [
+                asyncio.ensure_future(service.tailor_resume(sample_resume, sample_job_description))
+                for _ in range(2)
+            ]
+            await asyncio.sleep(0)
+            for caller in callers:
+                caller.cancel()
+            await asyncio.gather(*callers, return_exceptions=True)
+            await failed.wait()
+            await asyncio.sleep(0.01)
+            # Drop the cancelled callers, whose frames still reference the shared task, so it is collected
+            del callers, caller
+            gc.collect()
+        finally:
+            loop.set_exception_handler(None)
         
-        assert result.tailored_resume.fit_score == 0
+        assert mock_client.chat_completion.call_count == 1
+        assert unhandled == []
 
     def test_calculate_fit_score_high_match(
         self,
@@ -188,6 +270,25 @@ class TestResumeTailorService:
         lowercase_keywords = [k.lower() for k in keywords]
         assert any("python" in k or "engineer" in k for k in lowercase_keywords)
 
+    def test_extract_keywords_matches_whole_words_only(self, sample_resume):
+        """Test that job words only match whole words in the resume."""
+        service = ResumeTailorService(openai_client=AsyncMock())
+        
+        job = JobDescription(
+            title="Engineer",
+            company="Acme",
+            description="Seeking a python person for kubernetes and scala work",
+            requirements=["Analytics mindset"]
+        )
+        resume = sample_resume.model_copy(update={"skills": ["Scalability", "Python"]})
+        
+        keywords = service.extract_keywords(resume, job)
+        
+        assert "python" in keywords
+        assert "kubernetes" not in keywords  # skills of the copy omit Kubernetes
+        assert "scala" not in keywords  # only a prefix of "scalability"
+        assert "analytics" in keywords  # whole word in "customer analytics dashboard"
+
     def test_extract_keywords_no_matches(self, sample_resume):
         """Test keyword extraction with no matches."""
         service = ResumeTailorService(openai_client=AsyncMock())
@@ -293,3 +394,88 @@ class TestResumeTailorEndpoint:
         
         assert response.status_code == 503
         assert "temporarily unavailable" in response.json()["detail"]["error"]
+
+    def test_tailor_endpoint_stream(
+        self,
+        test_client,
+        sample_resume,
+        sample_job_description
+    ):
+        """Test that ?stream=1 returns the tailoring response as server-sent events."""
+        request_data = {
+            "resume": sample_resume.model_dump(),
+            "job_description": sample_job_description.model_dump()
+        }
+        
+        response = test_client.post(
+            "/api/v1/resume/tailor?stream=1",
+            json=request_data
+        )
+        
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        events = [line[len("data: "):] for line in response.text.split("\n\n") if line]
+        assert events[-1] == "[DONE]"
+        body = "".join(json.loads(event) for event in events[:-1])
+        assert json.loads(body)["tailored_resume"]["fit_score"] == 87
+
+    @patch('src.routers.resume.ResumeTailorService')
+    def test_tailor_endpoint_stream_error_before_first_chunk(
+        self,
+        mock_service_class,
+        test_client,
+        sample_resume,
+        sample_job_description
+    ):
+        """Test that a stream failing before its first delta returns 503."""
+        async def failing_stream(**kwargs):
+            raise OpenAIClientError("API unavailable")
+            yield
+        
+        mock_service_class.return_value.tailor_resume_stream = failing_stream
+        
+        request_data = {
+            "resume": sample_resume.model_dump(),
+            "job_description": sample_job_description.model_dump()
+        }
+        
+        response = test_client.post(
+            "/api/v1/resume/tailor?stream=1",
+            json=request_data
+        )
+        
+        assert response.status_code == 503
+        assert "temporarily unavailable" in response.json()["detail"]["error"]
+
+    @patch('src.routers.resume.ResumeTailorService')
+    def test_tailor_endpoint_stream_error_mid_stream(
+        self,
+        mock_service_class,
+        test_client,
+        sample_resume,
+        sample_job_description
+    ):
+        """Test that a stream failing after deltas were sent ends with an error event."""
+        async def interrupted_stream(**kwargs):
+            yield '{"tailored_resume": '
+            raise OpenAIClientError("OpenAI stream interrupted")
+        
+        mock_service_class.return_value.tailor_resume_stream = interrupted_stream
+        
+        request_data = {
+            "resume": sample_resume.model_dump(),
+            "job_description": sample_job_description.model_dump()
+        }
+        
+        response = test_client.post(
+            "/api/v1/resume/tailor?stream=1",
+            json=request_data
+        )
+        
+        assert response.status_code == 200
+        frames = [frame for frame in response.text.split("\n\n") if frame]
+        assert frames[0] == 'data: ' + json.dumps('{"tailored_resume": ')
+        event, data = frames[-1].split("\n")
+        assert event == "event: error"
+        assert json.loads(data[len("data: "):])["message"] == "OpenAI stream interrupted"
+        assert "data: [DONE]" not in frames
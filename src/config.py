@@ -1,32 +1,68 @@
-import os
-from dotenv import load_dotenv
+from functools import cached_property, lru_cache
+from typing import List, Optional
 
-# Load environment variables from a .env file
-load_dotenv()
+from pydantic import Field, computed_field
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
-class Settings:
-    # Job Targeting
-    JOB_TITLES = [t.strip() for t in os.getenv("JOB_TITLES", "").split(',') if t.strip()]
-    JOB_GEOS = [g.strip() for g in os.getenv("JOB_GEOS", "").split(',') if g.strip()]
-    MIN_COMPENSATION = int(os.getenv("MIN_COMPENSATION", 0))
+
+def _split_csv(value: str) -> List[str]:
+    """Split a comma-separated environment value into stripped, non-empty items."""
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
+class Settings(BaseSettings):
+    """Pipeline settings loaded once from environment variables and the `.env` file."""
+
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        env_file_encoding="utf-8",
+        case_sensitive=False,
+        extra="ignore",
+        frozen=True,
+    )
+
+    # Job Targeting (comma-separated in the environment)
+    job_titles_csv: str = Field(default="", validation_alias="JOB_TITLES")
+    job_geos_csv: str = Field(default="", validation_alias="JOB_GEOS")
+    min_compensation: int = 0
 
     # OpenAI API Key
-    OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+    openai_api_key: Optional[str] = None
 
     # Email settings
-    SMTP_HOST = os.getenv("SMTP_HOST")
-    SMTP_PORT = int(os.getenv("SMTP_PORT", 587))
-    SMTP_USERNAME = os.getenv("SMTP_USERNAME")
-    SMTP_PASSWORD = os.getenv("SMTP_PASSWORD")
-    SMTP_FROM = os.getenv("SMTP_FROM")
-    SMTP_TO = os.getenv("SMTP_TO")
+    smtp_host: Optional[str] = None
+    smtp_port: int = 587
+    smtp_username: Optional[str] = None
+    smtp_password: Optional[str] = None
+    smtp_from: Optional[str] = None
+    smtp_to: Optional[str] = None
 
     # Apollo API Key
-    APOLLO_API_KEY = os.getenv("APOLLO_API_KEY")
+    apollo_api_key: Optional[str] = None
+
+    @computed_field
+    @cached_property
+    def job_titles(self) -> List[str]:
+        return _split_csv(self.job_titles_csv)
+
+    @computed_field
+    @cached_property
+    def job_geos(self) -> List[str]:
+        return _split_csv(self.job_geos_csv)
 
     # Feature flags
-    EMAIL_ENABLED = bool(SMTP_HOST and SMTP_USERNAME and SMTP_PASSWORD)
-    APOLLO_ENABLED = bool(APOLLO_API_KEY)
+    @computed_field
+    @property
+    def email_enabled(self) -> bool:
+        return bool(self.smtp_host and self.smtp_username and self.smtp_password)
+
+    @computed_field
+    @property
+    def apollo_enabled(self) -> bool:
+        return bool(self.apollo_api_key)
+
 
-# Instantiate settings to be imported by other modules
-settings = Settings()
+@lru_cache()
+def get_settings() -> Settings:
+    """Get the cached settings instance shared by the pipeline modules."""
+    return Settings()
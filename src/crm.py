@@ -1,8 +1,11 @@
+import logging
 import pandas as pd
 import os
 from datetime import datetime
 from typing import Dict, Optional
 
+log = logging.getLogger(__name__)
+
 def clean_crm_logs():
     """
     Deletes existing CRM log files to ensure a clean slate for the current run.
@@ -12,15 +15,15 @@ def clean_crm_logs():
         if os.path.exists(log_file):
             try:
                 os.remove(log_file)
-                print(f"🧹 Removed old log file: {log_file}")
+                log.info("🧹 Removed old log file: %s", log_file)
             except OSError as e:
-                print(f"❌ Error removing log file {log_file}: {e}")
+                log.error("❌ Error removing log file %s: %s", log_file, e)
 
 def update_application_log(job_details: pd.Series, resume_path: Optional[str], status: str):
     """
     Append a new application record to crm/applications.csv.
     
-    Creates a single-row log entry using job_details (job_details.name as job_id) with a generated application_id and ISO timestamp, company, title, status, resume_variant_path (uses "N/A" when resume_path is None or empty), and score, then appends it to crm/applications.csv. Writes CSV headers only when the file does not exist or is empty. I/O errors are caught and reported via printed messages; this function does not raise on write failure.
+    Creates a single-row log entry using job_details (job_details.name as job_id) with a generated application_id and ISO timestamp, company, title, status, resume_variant_path (uses "N/A" when resume_path is None or empty), and score, then appends it to crm/applications.csv. Writes CSV headers only when the file does not exist or is empty. I/O errors are caught and logged; this function does not raise on write failure.
     """
     log_path = 'crm/applications.csv'
 
@@ -43,6 +46,6 @@ def update_application_log(job_details: pd.Series, resume_path: Optional[str], s
 
     try:
         new_log_entry.to_csv(log_path, mode='a', header=write_header, index=False)
-        print(f"✅ Logged application for '{job_details.get('title')}' to {log_path}")
+        log.info("✅ Logged application for '%s' to %s", job_details.get('title'), log_path)
     except Exception as e:
-        print(f"❌ Failed to log application for '{job_details.get('title')}': {e}")
+        log.error("❌ Failed to log application for '%s': %s", job_details.get('title'), e)
@@ -2,10 +2,19 @@ import pandas as pd
 from fastapi import FastAPI, Request
 from fastapi.responses import HTMLResponse
 from fastapi.templating import Jinja2Templates
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, select_autoescape
 import uvicorn
 
 app = FastAPI()
-templates = Jinja2Templates(directory="templates")
+
+# Templates are compiled once per process (no mtime checks on every render), and
+# their compiled bytecode is cached on disk so restarts skip the parse/compile step.
+templates = Jinja2Templates(env=Environment(
+    loader=FileSystemLoader("templates"),
+    autoescape=select_autoescape(),
+    auto_reload=False,
+    bytecode_cache=FileSystemBytecodeCache(),
+))
 
 @app.get("/", response_class=HTMLResponse)
 async def read_root(request: Request):
@@ -20,11 +29,16 @@ async def read_root(request: Request):
     Returns:
         templates.TemplateResponse: A TemplateResponse containing the rendered dashboard HTML.
     """
-    return templates.TemplateResponse("dashboard.html", {"request": request})
+    return templates.TemplateResponse(request, "dashboard.html")
 
 @app.get("/data/applications", response_class=HTMLResponse)
-async def get_applications_data(request: Request):
-    """Provides the applications table HTML fragment."""
+def get_applications_data(request: Request):
+    """
+    Provides the applications table HTML fragment.
+    
+    Declared as a plain function so FastAPI runs it in its threadpool: reading the CRM CSV
+    and rendering a large table would otherwise block the event loop for every other request.
+    """
     try:
         df = pd.read_csv("crm/applications.csv")
         applications_data = df.sort_values(by="timestamp", ascending=False).to_dict(orient="records")
@@ -32,8 +46,9 @@ async def get_applications_data(request: Request):
         applications_data = []
 
     return templates.TemplateResponse(
+        request,
         "fragments/applications_table.html",
-        {"request": request, "applications": applications_data}
+        {"applications": applications_data}
     )
 
 if __name__ == "__main__":
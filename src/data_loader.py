@@ -1,31 +1,148 @@
+import importlib.util
+import logging
+import os
+import aiofiles
+import aiofiles.os
 import pandas as pd
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Literal, Callable, List, Tuple
 
-def load_jobs_from_csv(filepath: str = "data/jobs/jobs.csv") -> Optional[pd.DataFrame]:
+log = logging.getLogger(__name__)
+
+JOBS_CSV_PATH = "data/jobs/jobs.csv"
+
+# Master resume contents already read in this process: filepath -> (mtime_ns, content)
+_resume_cache: Dict[str, Tuple[int, str]] = {}
+
+def _parquet_cache_paths(filepath: str) -> tuple:
+    """Return the (parquet, signature sidecar) paths cached next to a CSV file."""
+    parquet_path = os.path.splitext(filepath)[0] + ".parquet"
+    return parquet_path, parquet_path + ".sig"
+
+def _csv_signature(filepath: str) -> str:
+    """Identify a CSV's current contents cheaply by its modification time and size."""
+    stat = os.stat(filepath)
+    return f"{stat.st_mtime_ns} {stat.st_size}"
+
+def _read_parquet_cache(filepath: str, columns: Optional[List[str]]) -> Optional[pd.DataFrame]:
+    """
+    Return the cached Parquet copy of filepath if it is still current, else None.
+    
+    Only the requested columns that exist in the file are read (Parquet is columnar, so the others are
+    never decoded). Any problem reading the cache, including pyarrow not being installed, is a miss.
+    """
+    parquet_path, sig_path = _parquet_cache_paths(filepath)
+    try:
+        with open(sig_path, encoding='utf-8') as f:
+            if f.read() != _csv_signature(filepath):
+                return None
+        if columns is not None:
+            import pyarrow.parquet as pq
+            available = set(pq.read_schema(parquet_path).names)
+            columns = [col for col in columns if col in available]
+        return pd.read_parquet(parquet_path, engine="pyarrow", columns=columns)
+    except (OSError, ImportError, ValueError):
+        return None
+
+def _write_parquet_cache(df: pd.DataFrame, filepath: str) -> None:
+    """Save df as the Parquet copy of filepath, followed by the CSV signature it was parsed from."""
+    parquet_path, sig_path = _parquet_cache_paths(filepath)
+    try:
+        df.to_parquet(parquet_path, engine="pyarrow", compression="zstd")
+        with open(sig_path, 'w', encoding='utf-8') as f:
+            f.write(_csv_signature(filepath))
+    except Exception as e:
+        log.warning("⚠️ Could not write Parquet cache %s: %s", parquet_path, e)
+
+def load_jobs_from_csv(
+    filepath: str = JOBS_CSV_PATH,
+    engine: Literal["pyarrow", "c", "python"] = "pyarrow",
+    chunksize: int = 100_000,
+    prefilter: Optional[Callable[[pd.DataFrame], pd.DataFrame]] = None,
+    columns: Optional[List[str]] = None,
+    use_parquet_cache: bool = True,
+) -> Optional[pd.DataFrame]:
     """
     Load job listings from a CSV file into a pandas DataFrame.
     
+    When pyarrow is installed, the parsed CSV is cached as a Parquet file next to it (jobs.csv ->
+    jobs.parquet, plus a jobs.parquet.sig sidecar holding the CSV's mtime and size). Later loads of an
+    unchanged CSV read the Parquet copy instead of parsing text, and the prefilter is applied to it in
+    one pass. Editing or replacing the CSV changes its signature, so the cache is rebuilt on the next load.
+    
+    Otherwise, without a prefilter, the whole file is parsed at once using pyarrow's multithreaded CSV
+    reader by default. pyarrow is an optional dependency: if it is not installed, the file is parsed with
+    pandas' own C parser instead and no cache is written.
+    
+    With a prefilter and no usable cache, the file is read in chunks of `chunksize` rows and each chunk
+    is passed through `prefilter` before being kept, so rows that would be filtered out later never
+    accumulate in memory (peak memory is one chunk plus the retained rows). When the Parquet cache is
+    being built, the whole file is parsed once instead, since the cache holds every row.
+    
+    Row index labels match the file's row numbers in every case. The number of rows read before
+    prefiltering is stored in `df.attrs["rows_read"]`.
+    
     Parameters:
         filepath (str): Path to the jobs CSV file (default: "data/jobs/jobs.csv").
+        engine (str): pandas CSV parser engine to try first for whole-file reads (default: "pyarrow").
+        chunksize (int): Rows per chunk when a prefilter is given (default: 100,000).
+        prefilter (callable, optional): Cheap row filter applied to each chunk as it is parsed.
+        columns (list of str, optional): Columns to load; others are skipped. Missing ones are ignored.
+        use_parquet_cache (bool): Read and maintain the Parquet cache when pyarrow is available (default: True).
     
     Returns:
         Optional[pd.DataFrame]: DataFrame with job listings on success, or None if the file cannot be read.
     """
+    use_parquet_cache = use_parquet_cache and importlib.util.find_spec("pyarrow") is not None
     try:
-        df = pd.read_csv(filepath)
-        print(f"Successfully loaded {len(df)} jobs from {filepath}")
+        df = _read_parquet_cache(filepath, columns) if use_parquet_cache else None
+        if df is not None:
+            source = _parquet_cache_paths(filepath)[0]
+            rows_read = len(df)
+            if prefilter is not None:
+                df = prefilter(df)
+        elif prefilter is None or use_parquet_cache:
+            source = filepath
+            try:
+                df = pd.read_csv(filepath, engine=engine)
+            except ImportError:
+                df = pd.read_csv(filepath, engine="c")
+            if use_parquet_cache:
+                _write_parquet_cache(df, filepath)
+            if columns is not None:
+                df = df[[col for col in columns if col in df.columns]]
+            rows_read = len(df)
+            if prefilter is not None:
+                df = prefilter(df)
+        else:
+            # The pyarrow engine cannot read in chunks, so chunked reads use the C parser
+            source = filepath
+            usecols = None if columns is None else (lambda col: col in columns)
+            parts = []
+            rows_read = 0
+            with pd.read_csv(filepath, chunksize=chunksize, usecols=usecols) as reader:
+                for chunk in reader:
+                    rows_read += len(chunk)
+                    parts.append(prefilter(chunk))
+            df = pd.concat(parts) if parts else pd.DataFrame()
+
+        df.attrs["rows_read"] = rows_read
+        log.info("Successfully loaded %d of %d jobs from %s", len(df), rows_read, source)
         return df
     except FileNotFoundError:
-        print(f"Error: The file was not found at {filepath}")
+        log.error("The file was not found at %s", filepath)
         return None
     except Exception as e:
-        print(f"An unexpected error occurred while reading the CSV: {e}")
+        log.error("An unexpected error occurred while reading the CSV: %s", e)
         return None
 
-def load_master_resume(filepath: str = "data/resume_master.md") -> Optional[str]:
+async def load_master_resume(filepath: str = "data/resume_master.md") -> Optional[str]:
     """
     Load the master resume Markdown file and return its contents as a UTF-8 string.
     
+    The file is read with aiofiles so the event loop is not blocked while it loads. The contents are kept
+    in memory keyed by the file's modification time, so repeated calls in one process (e.g. a long-running
+    server or repeated pipeline runs) return the same string without reading the file again until it changes.
+    
     Parameters:
         filepath (str): Path to the Markdown file. Defaults to "data/resume_master.md".
     
@@ -33,13 +150,19 @@ def load_master_resume(filepath: str = "data/resume_master.md") -> Optional[str]
         Optional[str]: The file contents as a string, or None if the file is not found or an error occurs while reading.
     """
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            resume_content = f.read()
-        print(f"Successfully loaded master resume from {filepath}")
+        mtime_ns = (await aiofiles.os.stat(filepath)).st_mtime_ns
+        cached = _resume_cache.get(filepath)
+        if cached is not None and cached[0] == mtime_ns:
+            return cached[1]
+
+        async with aiofiles.open(filepath, 'r', encoding='utf-8') as f:
+            resume_content = await f.read()
+        _resume_cache[filepath] = (mtime_ns, resume_content)
+        log.info("Successfully loaded master resume from %s", filepath)
         return resume_content
     except FileNotFoundError:
-        print(f"Error: The master resume file was not found at {filepath}")
+        log.error("The master resume file was not found at %s", filepath)
         return None
     except Exception as e:
-        print(f"An unexpected error occurred while reading the resume file: {e}")
+        log.error("An unexpected error occurred while reading the resume file: %s", e)
         return None
@@ -1,17 +1,79 @@
+import atexit
+import logging
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from src.config import settings
+from functools import lru_cache
+from typing import Optional, Union
+from src.config import get_settings
+
+log = logging.getLogger(__name__)
+
+class SmtpSender:
+    """
+    Sends mail over a single authenticated SMTP-over-SSL connection that is reused across sends.
+    
+    The connection is opened and logged in lazily on the first send. Before each later send it is
+    checked with NOOP and transparently re-established if the server has dropped it. It is closed
+    with QUIT when the process exits (or when close() is called).
+    """
+
+    def __init__(self, host: str, port: int, username: str, password: str):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self._conn: Optional[smtplib.SMTP_SSL] = None
+        atexit.register(self.close)
+
+    def _connection(self) -> smtplib.SMTP_SSL:
+        """Return a live, authenticated connection, reconnecting if the cached one is gone."""
+        if self._conn is not None:
+            try:
+                if self._conn.noop()[0] == 250:
+                    return self._conn
+            except (smtplib.SMTPException, OSError):
+                pass
+            self.close()
+
+        conn = smtplib.SMTP_SSL(self.host, self.port)
+        try:
+            conn.login(self.username, self.password)
+        except Exception:
+            conn.close()
+            raise
+        self._conn = conn
+        return conn
+
+    def send(self, from_addr: str, to_addrs: str, message: Union[str, bytes]) -> None:
+        """Send an already-serialized message, reusing the cached connection when possible."""
+        self._connection().sendmail(from_addr, to_addrs, message)
+
+    def close(self) -> None:
+        """Close the cached connection, if any. Safe to call more than once."""
+        conn, self._conn = self._conn, None
+        if conn is None:
+            return
+        try:
+            conn.quit()
+        except (smtplib.SMTPException, OSError):
+            conn.close()
+
+@lru_cache()
+def get_smtp_sender() -> SmtpSender:
+    """Get the process-wide SmtpSender for the configured SMTP server."""
+    settings = get_settings()
+    return SmtpSender(settings.smtp_host, settings.smtp_port, settings.smtp_username, settings.smtp_password)
 
 def send_report_email(html_content: str):
     """
-    Send an HTML report via SMTP using configuration from src.config.settings.
+    Send an HTML report via SMTP using configuration from src.config.get_settings().
     
-    If settings.EMAIL_ENABLED is falsy the function returns without sending. When enabled,
-    the function composes a multipart HTML email (Subject: "AJOB4AGENT Daily Report - {SMTP_FROM}"),
-    connects to the SMTP server over SSL (SMTP_HOST, SMTP_PORT), authenticates with
-    SMTP_USERNAME/SMTP_PASSWORD, and sends the message from SMTP_FROM to SMTP_TO.
-    Status and errors are reported with print statements.
+    If settings.email_enabled is falsy the function returns without sending. When enabled,
+    the function composes a multipart HTML email (Subject: "AJOB4AGENT Daily Report - {smtp_from}")
+    and sends it from smtp_from to smtp_to through get_smtp_sender(), which keeps one SSL connection
+    to smtp_host:smtp_port, authenticated with smtp_username/smtp_password, open for later sends.
+    Status and errors are reported through the module logger.
     
     Parameters:
         html_content (str): HTML string used as the email body.
@@ -19,29 +81,25 @@ def send_report_email(html_content: str):
     Returns:
         None
     """
-    if not settings.EMAIL_ENABLED:
-        print("📧 Email sending is disabled. Skipping.")
+    settings = get_settings()
+    if not settings.email_enabled:
+        log.info("📧 Email sending is disabled. Skipping.")
         return
 
-    print("📧 Attempting to send daily report email...")
+    log.info("📧 Attempting to send daily report email...")
 
     message = MIMEMultipart("alternative")
-    message["Subject"] = f"AJOB4AGENT Daily Report - {settings.SMTP_FROM}"
-    message["From"] = settings.SMTP_FROM
-    message["To"] = settings.SMTP_TO
+    message["Subject"] = f"AJOB4AGENT Daily Report - {settings.smtp_from}"
+    message["From"] = settings.smtp_from
+    message["To"] = settings.smtp_to
 
     # Attach the HTML content
-    part = MIMEText(html_content, "html")
+    part = MIMEText(html_content, "html", "utf-8")
     message.attach(part)
 
     try:
-        # Using a secure context
-        with smtplib.SMTP_SSL(settings.SMTP_HOST, settings.SMTP_PORT) as server:
-            server.login(settings.SMTP_USERNAME, settings.SMTP_PASSWORD)
-            server.sendmail(
-                settings.SMTP_FROM, settings.SMTP_TO, message.as_string()
-            )
-        print(f"✅ Email report sent successfully to {settings.SMTP_TO}")
+        get_smtp_sender().send(settings.smtp_from, settings.smtp_to, message.as_bytes())
+        log.info("✅ Email report sent successfully to %s", settings.smtp_to)
     except Exception as e:
-        print(f"❌ Failed to send email report. Error: {e}")
-        print("   Please check your SMTP settings in the .env file.")
+        log.error("❌ Failed to send email report. Error: %s", e)
+        log.error("   Please check your SMTP settings in the .env file.")
@@ -0,0 +1,75 @@
+import contextlib
+import functools
+import os
+import uuid
+from pathlib import Path
+
+import aiofiles
+import aiofiles.os
+
+# Generated files are written in one large buffered call rather than many 8 KiB ones
+WRITE_BUFFER_SIZE = 1 << 20
+
+
+@functools.lru_cache(maxsize=None)
+def ensure_dir(path: Path) -> Path:
+    """
+    Create directory path (and its parents) the first time it is requested in this process and return it.
+
+    Later calls for the same path return immediately without touching the filesystem.
+    """
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def _temp_path(filepath: str) -> str:
+    """Return a unique temporary path next to filepath, so concurrent writers never share one."""
+    return f"{filepath}.{uuid.uuid4().hex[:8]}.tmp"
+
+
+@contextlib.contextmanager
+def open_atomic(filepath: str):
+    """
+    Context manager yielding a binary file handle for incrementally writing filepath atomically.
+
+    Writes go to a temporary file in the same directory, which replaces filepath with os.replace only
+    when the block exits normally, so readers only ever see the old or the complete new file. On error
+    the temporary file is removed, filepath is left untouched, and the error is re-raised.
+    """
+    tmp_path = _temp_path(filepath)
+    try:
+        with open(tmp_path, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+            yield f
+        os.replace(tmp_path, filepath)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def write_text_atomic(filepath: str, content: str) -> None:
+    """Write content to filepath as UTF-8 (binary mode, no newline translation) via open_atomic."""
+    with open_atomic(filepath) as f:
+        f.write(content.encode('utf-8'))
+
+
+@contextlib.asynccontextmanager
+async def open_atomic_async(filepath: str):
+    """
+    Same as open_atomic, but yields an aiofiles handle so writes and the rename do not block the event loop.
+    """
+    tmp_path = _temp_path(filepath)
+    try:
+        async with aiofiles.open(tmp_path, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+            yield f
+        await aiofiles.os.replace(tmp_path, filepath)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+async def write_text_atomic_async(filepath: str, content: str) -> None:
+    """Same as write_text_atomic, but the write and rename go through aiofiles and do not block the event loop."""
+    async with open_atomic_async(filepath) as f:
+        await f.write(content.encode('utf-8'))
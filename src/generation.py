@@ -1,23 +1,162 @@
-import os
+import asyncio
+import functools
+import importlib.util
+import json
+import logging
+import re
+import string
+from pathlib import Path
+import httpx
 import openai
-from src.config import settings
-from typing import Dict, Optional
+from src import llm_cache
+from src.file_io import ensure_dir, open_atomic_async, write_text_atomic_async
+from src.config import get_settings
+from typing import Dict, List, Optional
 
-def get_openai_client() -> Optional[openai.OpenAI]:
+log = logging.getLogger(__name__)
+
+LLM_MODEL = "gpt-4-turbo-2024-04-09"
+
+RESUME_VARIANTS_DIR = Path("out/resume_variants")
+INTERVIEW_PACKS_DIR = Path("reports")
+
+# Filename sanitizers: keep letters, digits, spaces and underscores (resume variants) or only
+# letters and digits (interview packs). \w is Unicode-aware, matching the str.isalnum() rules.
+_RESUME_FILENAME_STRIP_RE = re.compile(r"[^\w ]")
+_PACK_FILENAME_STRIP_RE = re.compile(r"[\W_]")
+
+# --- Prompts ---
+# Built once at import; each call only substitutes the $-placeholders. Everything that is identical
+# across jobs (instructions + master resume, or the interview-pack instructions) is sent first so
+# OpenAI's automatic prompt cache can reuse that prefix; job or company details come last.
+
+_RESUME_SYSTEM_PROMPT = "You are an expert resume writer and career coach."
+
+_RESUME_PROMPT = string.Template("""\
+You are an expert career coach and resume writer. Your task is to tailor the following master resume for the job application described in the next message.
+
+**Instructions:**
+1.  Analyze the job description to identify the key skills, experiences, and qualifications the employer is seeking.
+2.  Rewrite the master resume to highlight the most relevant aspects of the candidate's background.
+3.  Quantify achievements where possible and align the summary and skills sections with the job's requirements.
+4.  Maintain a professional tone and a clean, readable Markdown format.
+5.  Do not invent new experiences. Only rephrase, reorder, and emphasize existing information.
+
+Produce the full, tailored resume as a complete Markdown document.
+
+**Master Resume:**
+---
+$resume_text
+---
+""")
+
+_JOB_PROMPT = string.Template("""\
+**Job Description:**
+---
+- **Company:** $company
+- **Title:** $title
+- **Description:** $description
+---
+""")
+
+# Sent after _RESUME_PROMPT in place of _JOB_PROMPT, so batched and single requests share a prefix.
+# The job list is last and is the only JSON array in the message.
+_BATCH_JOBS_PROMPT = string.Template("""\
+Tailor the master resume separately for each job described below, following the instructions above for every one.
+
+Respond with a JSON object whose "resumes" key holds a list with one object per job. Each object has an "id" key set to the job's id and a "markdown" key holding the full tailored resume for that job as a complete Markdown document.
+
+**Job Descriptions (JSON):**
+$jobs_json
+""")
+
+_INTERVIEW_PACK_SYSTEM_PROMPT = "You are a senior business analyst who creates executive briefings for job candidates."
+
+_INTERVIEW_PACK_INSTRUCTIONS = """\
+You are a senior business analyst providing a briefing to a job candidate. Your task is to create a concise "Interview Preparation Pack" for the company named in the next message.
+
+Base the report *only* on the articles and text provided in the next message.
+
+**Instructions:**
+Generate a well-structured report in Markdown format. The report must include the following sections:
+1.  **Company Summary:** A brief, one-paragraph summary of the company's main business based on the text.
+2.  **Key Developments:** A bulleted list of the most important recent events, product launches, or financial news mentioned in the articles.
+3.  **Potential Talking Points & Questions:** Based *strictly* on the articles, suggest 3-5 insightful questions the candidate could ask the interviewer. These should demonstrate they've done their research.
+
+Structure the output clearly with Markdown headings. Do not include any information not present in the provided text.
+"""
+
+_COMPANY_PROMPT = string.Template("""\
+**Company:** $company_name
+
+**Provided Articles & Text:**
+---
+$articles_text
+---
+""")
+
+# Streamed completions are written out whenever this many characters have arrived since the last
+# write, rather than once per token-sized delta
+STREAM_WRITE_THRESHOLD = 4096
+
+# Jobs per batched generation request; every resume in a batch must fit in one response's output tokens,
+# RESUME_BATCH_MAX_TOKENS, which is LLM_MODEL's output limit
+RESUME_BATCH_SIZE = 2
+RESUME_BATCH_MAX_TOKENS = 4096
+
+# Transient failures (rate limits, connection errors, timeouts, 408/409/5xx) are retried by the
+# OpenAI client itself with jittered exponential backoff, honouring Retry-After; other errors are not.
+LLM_MAX_RETRIES = 5
+
+# Connection pool shared by every OpenAI request in the process
+HTTP_POOL_LIMITS = httpx.Limits(max_connections=32, max_keepalive_connections=32)
+HTTP_TIMEOUT = 60.0
+
+@functools.lru_cache(maxsize=1)
+def get_async_openai_client() -> Optional[openai.AsyncOpenAI]:
     """
-    Initializes and returns the OpenAI client if the API key is available.
+    Initializes and returns the async OpenAI client if the API key is available.
+    
+    The client is created once and shared until close_async_openai_client is called, so its pooled keep-alive connections are reused
+    by every generation call instead of paying a new TLS handshake each time. HTTP/2 is used when the
+    optional h2 package is installed, letting concurrent requests share a single connection. Transient
+    API errors are retried up to LLM_MAX_RETRIES times before a request fails.
     """
-    api_key = settings.OPENAI_API_KEY
+    api_key = get_settings().openai_api_key
     if not api_key:
-        print("⚠️ Warning: OPENAI_API_KEY is not set. Generation features will be skipped.")
+        log.warning("⚠️ OPENAI_API_KEY is not set. Generation features will be skipped.")
         return None
-    return openai.OpenAI(api_key=api_key)
+    http_client = httpx.AsyncClient(
+        http2=importlib.util.find_spec("h2") is not None,
+        limits=HTTP_POOL_LIMITS,
+        timeout=HTTP_TIMEOUT,
+    )
+    return openai.AsyncOpenAI(api_key=api_key, max_retries=LLM_MAX_RETRIES, http_client=http_client)
+
+async def close_async_openai_client() -> None:
+    """
+    Close the shared async OpenAI client, if one was created, and forget it.
+    
+    Its pooled connections belong to the event loop they were opened on, so callers running inside
+    asyncio.run() call this before the loop ends; a later loop then gets a fresh client from
+    get_async_openai_client instead of connections tied to a closed loop.
+    """
+    if get_async_openai_client.cache_info().currsize == 0:
+        return
+    client = get_async_openai_client()
+    get_async_openai_client.cache_clear()
+    if client is not None:
+        await client.close()
 
-def generate_resume_variant(client: openai.OpenAI, resume_text: str, job_details: Dict) -> Optional[str]:
+async def generate_resume_variant(client: openai.AsyncOpenAI, resume_text: str, job_details: Dict) -> Optional[str]:
     """
-    Generate a tailored resume Markdown file for a specific job using the provided OpenAI client.
+    Generate a tailored resume Markdown file for a specific job using the provided async OpenAI client.
+    
+    Given a master resume and job details, prompts an LLM to rephrase, reorder, and emphasize existing information to better match the job (quantifying achievements where possible) without inventing new experiences. Saves the result to out/resume_variants/resume_<company>_<title>.md and returns the saved file path. Completions are cached on disk by prompt (see src.llm_cache), so re-running on the same job and resume skips the API call.
     
-    Given a master resume and job details, prompts an LLM to rephrase, reorder, and emphasize existing information to better match the job (quantifying achievements where possible) without inventing new experiences. Saves the result to out/resume_variants/resume_<company>_<title>.md and returns the saved file path.
+    On a cache miss the completion is streamed and written to the file as it arrives, so disk writes overlap
+    generation instead of starting after it. Awaiting the stream and the file writes lets callers generate
+    variants for several jobs concurrently.
     
     Parameters:
         resume_text (str): Full master resume content to be tailored.
@@ -29,128 +168,277 @@ def generate_resume_variant(client: openai.OpenAI, resume_text: str, job_details
     if not client:
         return None
 
-    company = job_details.get('company', 'N/A').strip()
-    title = job_details.get('title', 'N/A').strip()
+    company, title = _job_company_title(job_details)
 
-    prompt = f"""
-You are an expert career coach and resume writer. Your task is to tailor the following master resume for a specific job application.
+    resume_prompt = _RESUME_PROMPT.substitute(resume_text=resume_text)
+    job_prompt = _JOB_PROMPT.substitute(
+        company=company,
+        title=title,
+        description=job_details.get('description', ''),
+    )
 
-**Master Resume:**
----
-{resume_text}
----
+    messages = [
+        {"role": "system", "content": _RESUME_SYSTEM_PROMPT},
+        {"role": "user", "content": resume_prompt},
+        {"role": "user", "content": job_prompt}
+    ]
+    temperature = 0.7
 
-**Job Description:**
----
-- **Company:** {company}
-- **Title:** {title}
-- **Description:** {job_details.get('description', '')}
----
-
-**Instructions:**
-1.  Analyze the job description to identify the key skills, experiences, and qualifications the employer is seeking.
-2.  Rewrite the master resume to highlight the most relevant aspects of the candidate's background.
-3.  Quantify achievements where possible and align the summary and skills sections with the job's requirements.
-4.  Maintain a professional tone and a clean, readable Markdown format.
-5.  Do not invent new experiences. Only rephrase, reorder, and emphasize existing information.
+    try:
+        cache_key = llm_cache.make_key(LLM_MODEL, messages, temperature)
+        tailored_resume = llm_cache.get(cache_key)
+        if tailored_resume is not None:
+            log.info("♻️ Using cached tailored resume for %s at %s.", title, company)
+            return await _save_resume_variant(company, title, tailored_resume)
 
-Produce the full, tailored resume as a complete Markdown document.
-    """
+        log.info("Generating tailored resume for %s at %s...", title, company)
+        filepath = _resume_variant_path(company, title)
+        tailored_resume = await _stream_llm_to_file(client, messages, temperature, filepath)
+        llm_cache.put(cache_key, LLM_MODEL, tailored_resume)
 
-    try:
-        print(f"Generating tailored resume for {title} at {company}...")
-        response = client.chat.completions.create(
-            model="gpt-4-turbo-2024-04-09",
-            messages=[
-                {"role": "system", "content": "You are an expert resume writer and career coach."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.7,
-        )
-        tailored_resume = response.choices[0].message.content
-
-        # --- Save the generated resume to a file ---
-        output_dir = "out/resume_variants"
-        os.makedirs(output_dir, exist_ok=True)
-
-        # Create a clean filename
-        safe_company = "".join(c for c in company if c.isalnum() or c in (' ', '_')).rstrip()
-        safe_title = "".join(c for c in title if c.isalnum() or c in (' ', '_')).rstrip()
-        filename = f"resume_{safe_company}_{safe_title}.md".replace(' ', '_').lower()
-        filepath = os.path.join(output_dir, filename)
-
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(tailored_resume)
-
-        print(f"✅ Successfully saved tailored resume to {filepath}")
+        log.info("✅ Successfully saved tailored resume to %s", filepath)
         return filepath
 
     except Exception as e:
-        print(f"❌ An error occurred during LLM call: {e}")
+        log.error("❌ An error occurred during LLM call: %s", e)
         return None
 
 
-def create_interview_pack(client: openai.OpenAI, company_name: str, articles_text: str) -> Optional[str]:
+async def generate_resume_variants_batch(client: openai.AsyncOpenAI, resume_text: str, jobs: List[Dict]) -> List[Optional[str]]:
     """
-    Create an interview preparation pack for a company from provided article text using the given OpenAI client.
+    Generate tailored resume Markdown files for several jobs with as few OpenAI requests as possible.
     
-    The function asks the LLM to produce a Markdown-formatted "Interview Preparation Pack" containing three sections: a one-paragraph Company Summary, a bulleted Key Developments list, and 3–5 Potential Talking Points & Questions. The LLM must base its output strictly on the supplied articles_text. If successful, the report is written to reports/interview_pack_<safe_company>.md and the file path is returned.
+    Jobs are grouped RESUME_BATCH_SIZE at a time. Each group is one JSON-mode request that sends the master
+    resume once, followed by the group's jobs as a JSON array, and asks for {"resumes": [{"id", "markdown"}]}
+    within RESUME_BATCH_MAX_TOKENS. Groups are requested concurrently; a group of one job (including a lone
+    job) is sent through generate_resume_variant instead. Any job the model leaves out (or a whole group whose
+    response was truncated or cannot be parsed) falls back to generate_resume_variant. Responses are cached on
+    disk like single completions (see src.llm_cache).
     
-    Preconditions:
-    - A valid OpenAI client must be provided; if not, the function returns None.
+    Parameters:
+        resume_text (str): Full master resume content to be tailored.
+        jobs (list of dict or pandas.Series): Job details, as accepted by generate_resume_variant.
     
     Returns:
-    - The path to the saved Markdown file on success, or None if the client is missing or an error occurs.
+        List[Optional[str]]: One entry per job, in order: the saved file path, or None on failure.
     """
     if not client:
-        print("⚠️ OpenAI client not available, skipping interview pack generation.")
-        return None
+        return [None] * len(jobs)
 
-    prompt = f"""
-You are a senior business analyst providing a briefing to a job candidate. Your task is to create a concise "Interview Preparation Pack" for the company: **{company_name}**.
+    batches = [jobs[i:i + RESUME_BATCH_SIZE] for i in range(0, len(jobs), RESUME_BATCH_SIZE)]
+    results = await asyncio.gather(*(_generate_resume_batch(client, resume_text, batch) for batch in batches))
+    return [path for batch_paths in results for path in batch_paths]
 
-Based *only* on the provided text below, generate the report.
 
-**Provided Articles & Text:**
----
-{articles_text}
----
+async def _generate_resume_batch(client: openai.AsyncOpenAI, resume_text: str, jobs: List[Dict]) -> List[Optional[str]]:
+    """Generate one batch of resume variants in a single request; see generate_resume_variants_batch."""
+    if len(jobs) == 1:
+        # A batch of one gains nothing from JSON mode, and a streamed single completion is cheaper to retry
+        return [await generate_resume_variant(client, resume_text, jobs[0])]
 
-**Instructions:**
-Generate a well-structured report in Markdown format. The report must include the following sections:
-1.  **Company Summary:** A brief, one-paragraph summary of the company's main business based on the text.
-2.  **Key Developments:** A bulleted list of the most important recent events, product launches, or financial news mentioned in the articles.
-3.  **Potential Talking Points & Questions:** Based *strictly* on the articles, suggest 3-5 insightful questions the candidate could ask the interviewer. These should demonstrate they've done their research.
+    fields = [_job_company_title(job) for job in jobs]
+    jobs_json = json.dumps(
+        [
+            {"id": i, "company": company, "title": title, "description": str(job.get('description', ''))}
+            for i, (job, (company, title)) in enumerate(zip(jobs, fields))
+        ],
+        ensure_ascii=False,
+        indent=2,
+    )
+    messages = [
+        {"role": "system", "content": _RESUME_SYSTEM_PROMPT},
+        {"role": "user", "content": _RESUME_PROMPT.substitute(resume_text=resume_text)},
+        {"role": "user", "content": _BATCH_JOBS_PROMPT.substitute(jobs_json=jobs_json)},
+    ]
+    temperature = 0.7
 
-Structure the output clearly with Markdown headings. Do not include any information not present in the provided text.
+    resumes: Dict[int, str] = {}
+    try:
+        cache_key = llm_cache.make_key(LLM_MODEL, messages, temperature)
+        content = llm_cache.get(cache_key)
+        if content is not None:
+            log.info("♻️ Using cached tailored resumes for a batch of %d jobs.", len(jobs))
+            resumes = _parse_batch_resumes(content)
+        else:
+            log.info("Generating tailored resumes for a batch of %d jobs...", len(jobs))
+            content = await _call_llm(
+                client,
+                messages,
+                temperature,
+                reject_truncated=True,
+                max_tokens=RESUME_BATCH_MAX_TOKENS,
+                response_format={"type": "json_object"},
+            )
+            resumes = _parse_batch_resumes(content)
+            if resumes:
+                llm_cache.put(cache_key, LLM_MODEL, content)
+    except (openai.APIError, ValueError) as e:
+        log.error("❌ Batched resume generation failed, generating individually: %s", e)
+
+    async def resolve(i: int) -> Optional[str]:
+        if i not in resumes:
+            return await generate_resume_variant(client, resume_text, jobs[i])
+        try:
+            return await _save_resume_variant(*fields[i], resumes[i])
+        except Exception as e:
+            log.error("❌ Failed to save tailored resume for %s at %s: %s", fields[i][1], fields[i][0], e)
+            return None
+
+    return list(await asyncio.gather(*(resolve(i) for i in range(len(jobs)))))
+
+
+async def _call_llm(
+    client: openai.AsyncOpenAI,
+    messages: List[Dict[str, str]],
+    temperature: float,
+    reject_truncated: bool = False,
+    **kwargs,
+) -> str:
     """
+    Return the text of a LLM_MODEL chat completion for messages.
+    
+    Transient errors have already been retried by the client (see get_async_openai_client) by the time
+    anything is raised here; callers decide how to report the remaining, non-transient failures. A completion
+    without text (e.g. stopped by the content filter or refused) raises ValueError, as does, with
+    reject_truncated, a completion cut off by the token limit.
+    """
+    response = await client.chat.completions.create(
+        model=LLM_MODEL,
+        messages=messages,
+        temperature=temperature,
+        **kwargs,
+    )
+    choice = response.choices[0]
+    if reject_truncated and choice.finish_reason == "length":
+        raise ValueError("completion was truncated at the output token limit")
+    if not isinstance(choice.message.content, str):
+        raise ValueError(f"completion has no text (finish reason: {choice.finish_reason})")
+    return choice.message.content
+
 
+async def _stream_llm_to_file(client: openai.AsyncOpenAI, messages: List[Dict[str, str]], temperature: float, filepath: str) -> str:
+    """
+    Stream a LLM_MODEL chat completion into filepath as it is generated and return the full text.
+    
+    Deltas are written in STREAM_WRITE_THRESHOLD-sized pieces to a temporary file that replaces filepath
+    once the stream completes (see file_io.open_atomic_async), so an interrupted stream never leaves a
+    truncated resume behind. The text is also kept so it can be stored in the LLM cache. The stream's HTTP
+    response is closed however writing ends.
+    """
+    stream = await client.chat.completions.create(
+        model=LLM_MODEL,
+        messages=messages,
+        temperature=temperature,
+        stream=True,
+    )
+    chunks: List[str] = []
+    written = 0
+    pending = 0
     try:
-        print(f"Generating interview pack for {company_name}...")
-        response = client.chat.completions.create(
-            model="gpt-4-turbo-2024-04-09",
-            messages=[
-                {"role": "system", "content": "You are a senior business analyst who creates executive briefings for job candidates."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.5,
-        )
-        interview_pack_content = response.choices[0].message.content
+        async with open_atomic_async(filepath) as f:
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if not delta:
+                    continue
+                chunks.append(delta)
+                pending += len(delta)
+                if pending >= STREAM_WRITE_THRESHOLD:
+                    await f.write("".join(chunks[written:]).encode('utf-8'))
+                    written = len(chunks)
+                    pending = 0
+            if written < len(chunks):
+                await f.write("".join(chunks[written:]).encode('utf-8'))
+    finally:
+        # Return the connection to the shared pool even if a write fails or the task is cancelled mid-stream
+        await stream.response.aclose()
+    return "".join(chunks)
 
-        # --- Save the generated pack to a file ---
-        output_dir = "reports"
-        os.makedirs(output_dir, exist_ok=True)
 
-        safe_company = "".join(c for c in company_name if c.isalnum()).lower()
+def _parse_batch_resumes(content: str) -> Dict[int, str]:
+    """Map job id to Markdown from a batched {"resumes": [...]} response, skipping malformed entries."""
+    payload = json.loads(content)
+    entries = payload.get("resumes") if isinstance(payload, dict) else None
+    if not isinstance(entries, list):
+        return {}
+    return {
+        entry["id"]: entry["markdown"]
+        for entry in entries
+        if isinstance(entry, dict) and isinstance(entry.get("id"), int) and isinstance(entry.get("markdown"), str)
+    }
+
+
+def _job_company_title(job_details: Dict) -> tuple:
+    """Return the stripped (company, title) of a job, defaulting each to 'N/A'."""
+    return job_details.get('company', 'N/A').strip(), job_details.get('title', 'N/A').strip()
+
+
+def _resume_variant_path(company: str, title: str) -> str:
+    """Return out/resume_variants/resume_<company>_<title>.md for a job, creating the directory if needed."""
+    # Create a clean filename
+    safe_company = _RESUME_FILENAME_STRIP_RE.sub('', company).rstrip()
+    safe_title = _RESUME_FILENAME_STRIP_RE.sub('', title).rstrip()
+    filename = f"resume_{safe_company}_{safe_title}.md".replace(' ', '_').lower()
+    return str(ensure_dir(RESUME_VARIANTS_DIR) / filename)
+
+
+async def _save_resume_variant(company: str, title: str, tailored_resume: str) -> str:
+    """Save a tailored resume to its _resume_variant_path and return that path."""
+    filepath = _resume_variant_path(company, title)
+    await write_text_atomic_async(filepath, tailored_resume)
+
+    log.info("✅ Successfully saved tailored resume to %s", filepath)
+    return filepath
+
+
+async def create_interview_pack(client: openai.AsyncOpenAI, company_name: str, articles_text: str) -> Optional[str]:
+    """
+    Create an interview preparation pack for a company from provided article text using the given async OpenAI client.
+    
+    The function asks the LLM to produce a Markdown-formatted "Interview Preparation Pack" containing three sections: a one-paragraph Company Summary, a bulleted Key Developments list, and 3–5 Potential Talking Points & Questions. The LLM must base its output strictly on the supplied articles_text. If successful, the report is written to reports/interview_pack_<safe_company>.md and the file path is returned. Completions are cached on disk by prompt (see src.llm_cache).
+    
+    Both the completion and the file write are awaited, so neither blocks the event loop.
+    
+    Preconditions:
+    - A valid async OpenAI client must be provided; if not, the function returns None.
+    
+    Returns:
+    - The path to the saved Markdown file on success, or None if the client is missing or an error occurs.
+    """
+    if not client:
+        log.warning("⚠️ OpenAI client not available, skipping interview pack generation.")
+        return None
+
+    company_prompt = _COMPANY_PROMPT.substitute(company_name=company_name, articles_text=articles_text)
+
+    messages = [
+        {"role": "system", "content": _INTERVIEW_PACK_SYSTEM_PROMPT},
+        {"role": "user", "content": _INTERVIEW_PACK_INSTRUCTIONS},
+        {"role": "user", "content": company_prompt}
+    ]
+    temperature = 0.5
+
+    try:
+        cache_key = llm_cache.make_key(LLM_MODEL, messages, temperature)
+        interview_pack_content = llm_cache.get(cache_key)
+        if interview_pack_content is not None:
+            log.info("♻️ Using cached interview pack for %s.", company_name)
+        else:
+            log.info("Generating interview pack for %s...", company_name)
+            interview_pack_content = await _call_llm(client, messages, temperature)
+            llm_cache.put(cache_key, LLM_MODEL, interview_pack_content)
+
+        # --- Save the generated pack to a file ---
+        safe_company = _PACK_FILENAME_STRIP_RE.sub('', company_name).lower()
         filename = f"interview_pack_{safe_company}.md"
-        filepath = os.path.join(output_dir, filename)
+        filepath = str(ensure_dir(INTERVIEW_PACKS_DIR) / filename)
 
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(interview_pack_content)
+        await write_text_atomic_async(filepath, interview_pack_content)
 
-        print(f"✅ Successfully saved interview pack to {filepath}")
+        log.info("✅ Successfully saved interview pack to %s", filepath)
         return filepath
 
-    except openai.APIError as e:
-        print(f"❌ An error occurred during LLM call for interview pack: {e}")
+    except Exception as e:
+        log.error("❌ An error occurred during LLM call for interview pack: %s", e)
         return None
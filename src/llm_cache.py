@@ -0,0 +1,67 @@
+import functools
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import time
+from typing import Dict, List, Optional
+
+log = logging.getLogger(__name__)
+
+CACHE_PATH = "out/llm_cache.sqlite"
+
+
+@functools.lru_cache(maxsize=None)
+def _connection() -> sqlite3.Connection:
+    """
+    Open (once per process) the SQLite database backing the LLM response cache, creating the
+    file and its table on first use.
+    """
+    os.makedirs(os.path.dirname(CACHE_PATH), exist_ok=True)
+    conn = sqlite3.connect(CACHE_PATH)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS llm_cache ("
+        "key TEXT PRIMARY KEY, model TEXT, value TEXT, created REAL)"
+    )
+    return conn
+
+
+def make_key(model: str, messages: List[Dict[str, str]], temperature: float) -> str:
+    """
+    Build the content-addressed cache key for a chat completion request.
+
+    The key is a BLAKE2b digest over the model, the full message list, and the temperature, so
+    any change to the prompt or sampling settings produces a different key.
+    """
+    payload = json.dumps([model, messages, temperature], ensure_ascii=False)
+    return hashlib.blake2b(payload.encode('utf-8')).hexdigest()
+
+
+def get(key: str) -> Optional[str]:
+    """
+    Return the cached completion text for key, or None on a miss.
+
+    Cache read errors are reported and treated as a miss so generation can fall back to the API.
+    """
+    try:
+        row = _connection().execute("SELECT value FROM llm_cache WHERE key = ?", (key,)).fetchone()
+    except sqlite3.Error as e:
+        log.warning("⚠️ LLM cache read failed: %s", e)
+        return None
+    return row[0] if row else None
+
+
+def put(key: str, model: str, value: str) -> None:
+    """
+    Store a completion under key, replacing any previous entry. Write errors are reported, not raised.
+    """
+    try:
+        conn = _connection()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, model, value, created) VALUES (?, ?, ?, ?)",
+                (key, model, value, time.time()),
+            )
+    except sqlite3.Error as e:
+        log.warning("⚠️ LLM cache write failed: %s", e)
@@ -1,8 +1,15 @@
+import asyncio
+import logging
 from src import data_loader, processing, generation, crm, reporting, email_client
-from src.config import settings
+from src.config import get_settings
 import pandas as pd
 
-def run_pipeline():
+log = logging.getLogger(__name__)
+
+# CRM log columns the summary and the report template read
+REPORT_COLUMNS = ['job_id', 'company', 'title', 'score', 'status', 'resume_variant_path']
+
+async def run_pipeline():
     """
     Orchestrate the end-to-end job-application pipeline: load data, normalize and score jobs,
     generate tailored resume variants for top matches, update the CRM application log,
@@ -10,104 +17,130 @@ def run_pipeline():
     
     Performs these high-level actions:
     - Clears previous CRM logs.
-    - Loads jobs and a master resume; exits early if either is missing or empty.
+    - Loads jobs (applying the compensation rule while parsing) and a master resume; exits early if
+      either is missing.
     - Normalizes and filters jobs using project settings; exits early if no jobs remain.
+      When the jobs CSV, resume and targeting settings are unchanged since a previous run, the cached
+      scored jobs from out/cache are reused and filtering and scoring are skipped.
     - Scores filtered jobs against the master resume and selects the top N (currently N=1).
-    - For each selected job: attempts to generate a resume variant (if an OpenAI client is available)
-      and records the outcome in the CRM with a status of "scored", "resume_generated", or "generation_failed".
+    - Generates resume variants for all selected jobs in concurrent batched requests (if an OpenAI client is available),
+      then records each outcome in the CRM with a status of "scored", "resume_generated", or "generation_failed".
     - Builds a summary from CRM logs, generates an HTML report, and emails the report if produced.
     
+    Progress is reported through logging; the root logger is configured for INFO output on first call
+    if the caller has not configured logging already.
+    
     Side effects:
     - Mutates CRM/application logs via crm.update_application_log and crm.clean_crm_logs.
-    - Reads/writes local files (CRM CSV and the generated HTML report).
+    - Reads/writes local files (reads the CRM CSV, writes the generated HTML report).
     - May send email through email_client.send_report_email.
     - Calls external services (e.g., OpenAI) when available.
     
     Notes:
     - The function uses early returns for missing initial data or when filtering yields no jobs.
-    - Exceptions for missing CRM or report files are handled internally (FileNotFoundError).
+    - A missing CRM file is handled internally (FileNotFoundError).
     """
-    print("=========================================")
-    print("🚀 Starting the AJOB4AGENT Pipeline")
-    print("=========================================")
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(name)s %(message)s')
 
-    crm.clean_crm_logs()
-
-    print("\n[1/5] ⚙️ Loading Configuration and Data...")
-    jobs_df = data_loader.load_jobs_from_csv()
-    master_resume = data_loader.load_master_resume()
+    log.info("=========================================")
+    log.info("🚀 Starting the AJOB4AGENT Pipeline")
+    log.info("=========================================")
 
-    if jobs_df is None or jobs_df.empty or master_resume is None:
-        print("\n❌ Halting pipeline: Could not load initial data (jobs or resume).")
-        return
-    print(f"✅ Loaded {len(jobs_df)} jobs and master resume.")
+    crm.clean_crm_logs()
 
-    print("\n[2/5] Normalizing and Filtering Jobs...")
-    filtered_jobs = processing.normalize_and_filter_jobs(jobs_df, settings)
-    if filtered_jobs.empty:
-        print("✅ No jobs match your criteria after filtering. Pipeline finished.")
+    log.info("[1/5] ⚙️ Loading Configuration and Data...")
+    settings = get_settings()
+    # Apply the compensation rule while parsing so rejected rows are never held in memory
+    jobs_df = data_loader.load_jobs_from_csv(
+        prefilter=processing.compensation_prefilter(settings),
+        columns=['company', 'title', 'location', 'compensation', 'description'],
+    )
+    master_resume = await data_loader.load_master_resume()
+
+    if jobs_df is None or master_resume is None:
+        log.error("❌ Halting pipeline: Could not load initial data (jobs or resume).")
         return
-    print("\nFiltered Jobs Preview:")
-    print(filtered_jobs[['company', 'title', 'location', 'compensation']].head())
-
-    print("\n[3/5] Scoring Roles...")
-    scored_jobs = processing.score_jobs(filtered_jobs, master_resume)
-    print("\nTop Scored Jobs Preview:")
-    print(scored_jobs[['company', 'title', 'location', 'score']].head())
-
-    print("\n[4/5] Generating Resume Variants and Updating CRM...")
-    client = generation.get_openai_client()
+    total_jobs = jobs_df.attrs.get("rows_read", len(jobs_df))
+    log.info("✅ Loaded %d of %d jobs and master resume.", len(jobs_df), total_jobs)
+
+    # Filtering and scoring depend only on the CSV, the resume and the targeting settings, so a previous
+    # run's result for the same inputs can be reused as is
+    scored_cache_path = processing.scored_jobs_cache_path(data_loader.JOBS_CSV_PATH, master_resume, settings)
+    scored_jobs = processing.read_scored_jobs_cache(scored_cache_path)
+    if scored_jobs is not None:
+        log.info("[2/5] ♻️ Inputs unchanged; reusing filtered and scored jobs from %s", scored_cache_path)
+        log.info("[3/5] ♻️ Skipping scoring.")
+    else:
+        log.info("[2/5] Normalizing and Filtering Jobs...")
+        filtered_jobs = processing.normalize_and_filter_jobs(jobs_df, settings)
+        if filtered_jobs.empty:
+            log.info("✅ No jobs match your criteria after filtering. Pipeline finished.")
+            return
+        log.info("Filtered Jobs Preview:\n%s", filtered_jobs[['company', 'title', 'location', 'compensation']].head())
+
+        log.info("[3/5] Scoring Roles...")
+        scored_jobs = processing.score_jobs(filtered_jobs, master_resume)
+        processing.write_scored_jobs_cache(scored_jobs, scored_cache_path)
+    log.info("Top Scored Jobs Preview:\n%s", scored_jobs[['company', 'title', 'location', 'score']].head())
+
+    log.info("[4/5] Generating Resume Variants and Updating CRM...")
+    client = generation.get_async_openai_client()
 
     # Let's process the top N jobs. For now, N=1
     top_n = 1
     jobs_to_process = scored_jobs.head(top_n)
+    jobs = [job for _, job in jobs_to_process.iterrows()]
+
+    # Several jobs are batched so the master resume is sent once per request rather than once per
+    # job, and batches are dispatched together so the wait is ~one round-trip
+    try:
+        resume_paths = await generation.generate_resume_variants_batch(client, master_resume, jobs)
+    finally:
+        # The client's pooled connections are bound to this event loop, so they must not outlive it
+        await generation.close_async_openai_client()
 
-    for index, job in jobs_to_process.iterrows():
-        print(f"\n--- Processing top job: {job['title']} at {job['company']} ---")
-        resume_path = None
+    for job, resume_path in zip(jobs, resume_paths):
+        log.info("--- Processed top job: %s at %s ---", job['title'], job['company'])
         status = "scored"
         if client:
-            resume_path = generation.generate_resume_variant(client, master_resume, job)
-            if resume_path:
-                status = "resume_generated"
-            else:
-                status = "generation_failed"
+            status = "resume_generated" if resume_path else "generation_failed"
 
         crm.update_application_log(job, resume_path, status)
 
-    print("\n[5/5] Generating HTML Report...")
-    # For the report, we'll read the entire CRM log
+    log.info("[5/5] Generating HTML Report...")
+    # For the report, we'll read every row of the CRM log, but only the columns it uses
     try:
-        applications_log_df = pd.read_csv('crm/applications.csv')
+        applications_log_df = pd.read_csv('crm/applications.csv', usecols=REPORT_COLUMNS)
     except FileNotFoundError:
-        applications_log_df = pd.DataFrame()
+        applications_log_df = pd.DataFrame(columns=REPORT_COLUMNS)
+    status_counts = applications_log_df['status'].value_counts()
 
     summary_data = {
-        "total_jobs": len(jobs_df),
-        "filtered_jobs": len(filtered_jobs),
-        "resumes_generated": applications_log_df[applications_log_df['status'] == 'resume_generated'].shape[0],
+        "total_jobs": total_jobs,
+        "filtered_jobs": len(scored_jobs),
+        "resumes_generated": int(status_counts.get('resume_generated', 0)),
         "top_job_title": scored_jobs.iloc[0]['title'] if not scored_jobs.empty else "N/A",
         "top_job_company": scored_jobs.iloc[0]['company'] if not scored_jobs.empty else "N/A",
         "top_job_score": scored_jobs.iloc[0]['score'] if not scored_jobs.empty else "N/A",
     }
 
     # We pass the applications that were processed in *this* run
-    processed_apps_df = applications_log_df[applications_log_df['job_id'].isin(jobs_to_process.index)]
+    # (.values skips index alignment for the mask)
+    processed_apps_df = applications_log_df.loc[applications_log_df['job_id'].isin(jobs_to_process.index).values]
 
-    report_path = reporting.generate_html_report(summary_data, processed_apps_df)
+    # The HTML is only kept in memory when it is going to be emailed
+    report_path, html_content = reporting.generate_html_report(
+        summary_data, processed_apps_df, keep_html=settings.email_enabled
+    )
 
+    # Email the rendered HTML directly rather than reading the report file back
     if report_path:
-        try:
-            with open(report_path, 'r', encoding='utf-8') as f:
-                html_content = f.read()
-            email_client.send_report_email(html_content)
-        except FileNotFoundError:
-            print(f"❌ Could not find report at {report_path} to email.")
+        email_client.send_report_email(html_content)
 
-    print("\n=========================================")
-    print("✅ Pipeline execution finished.")
-    print("=========================================")
+    log.info("=========================================")
+    log.info("✅ Pipeline execution finished.")
+    log.info("=========================================")
 
 
 if __name__ == "__main__":
-    run_pipeline()
+    asyncio.run(run_pipeline())
@@ -1,12 +1,123 @@
+import functools
+import hashlib
+import importlib.util
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+import re
+import numpy as np
 import pandas as pd
-from typing import List
+from typing import Callable, Dict, List, Optional, Tuple
 from src.config import Settings
 
+try:
+    import ahocorasick
+except ImportError:  # Optional: score_jobs falls back to a regex alternation
+    ahocorasick = None
+
+log = logging.getLogger(__name__)
+
+# Text columns are held as Arrow strings when pyarrow is installed: one contiguous UTF-8 buffer per column,
+# with .str methods running as Arrow compute kernels instead of per-object Python calls
+ARROW_STRING_DTYPE = pd.StringDtype("pyarrow") if importlib.util.find_spec("pyarrow") is not None else None
+
+# Below this many rows, a boolean mask is cheaper than setting up a numexpr-backed DataFrame.query
+QUERY_MIN_ROWS = 10_000
+
+# From this many descriptions up, scoring is split across worker processes; below it, process startup
+# and pickling cost more than they save
+PARALLEL_SCORING_MIN_ROWS = 20_000
+
+# Scored jobs from earlier runs, one Parquet file per combination of inputs
+SCORED_JOBS_CACHE_DIR = "out/cache"
+# Part of every scored jobs cache key; bump it whenever filtering or scoring would give different results
+# for the same inputs, so caches written by older code are not served
+SCORED_JOBS_CACHE_VERSION = 2
+
+def compensation_prefilter(settings: Settings) -> Callable[[pd.DataFrame], pd.DataFrame]:
+    """
+    Build a cheap row filter for data_loader.load_jobs_from_csv that applies the minimum
+    compensation rule while the CSV is being parsed.
+    
+    The returned callable keeps rows whose 'compensation' is numeric and >= settings.min_compensation,
+    the same rule normalize_and_filter_jobs applies, so prefiltering never changes the pipeline's result.
+    Frames without a 'compensation' column are returned unchanged.
+    """
+    def prefilter(chunk: pd.DataFrame) -> pd.DataFrame:
+        if 'compensation' not in chunk.columns:
+            return chunk
+        compensation = pd.to_numeric(chunk['compensation'], errors='coerce')
+        return chunk[compensation >= settings.min_compensation]
+
+    return prefilter
+
+def scored_jobs_cache_path(jobs_csv_path: str, resume_text: str, settings: Settings) -> str:
+    """
+    Return the cache file path for the scored jobs produced from these inputs.
+    
+    The file name is a BLAKE2b digest of SCORED_JOBS_CACHE_VERSION, the jobs CSV's bytes, the resume text, and
+    the settings that affect filtering (job titles, geos, minimum compensation), so changing any input, or the
+    filtering and scoring logic, selects a different file.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"v{SCORED_JOBS_CACHE_VERSION}\n".encode('utf-8'))
+    with open(jobs_csv_path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    digest.update(resume_text.encode('utf-8'))
+    digest.update(repr((settings.job_titles, settings.job_geos, settings.min_compensation)).encode('utf-8'))
+    return os.path.join(SCORED_JOBS_CACHE_DIR, f"{digest.hexdigest()}.parquet")
+
+def read_scored_jobs_cache(cache_path: str) -> Optional[pd.DataFrame]:
+    """Return the cached scored jobs at cache_path, or None if there are none (or pyarrow is not installed)."""
+    if not os.path.exists(cache_path):
+        return None
+    try:
+        return pd.read_parquet(cache_path)
+    except Exception as e:
+        log.warning("⚠️ Could not read scored jobs cache %s: %s", cache_path, e)
+        return None
+
+def write_scored_jobs_cache(scored_df: pd.DataFrame, cache_path: str) -> None:
+    """Save scored jobs (index included) to cache_path; failures are reported and otherwise ignored."""
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        scored_df.to_parquet(cache_path)
+    except ImportError:
+        pass
+    except Exception as e:
+        log.warning("⚠️ Could not write scored jobs cache %s: %s", cache_path, e)
+
+def _contains_any(values: pd.Series, targets: List[str]) -> np.ndarray:
+    """
+    Return a boolean mask of the string values that contain any of the target substrings.
+    
+    The column is factorized to a Categorical so the check runs once per distinct value, then broadcast
+    back to rows through the category codes. Targets are a small fixed vocabulary, so each value is tested
+    with plain `in` (C-level substring search) against the deduplicated targets rather than a regex.
+    Missing values never match; an empty target list matches every non-missing value.
+    """
+    categorical = values.astype('category')
+    categories = categorical.cat.categories
+    patterns = frozenset(targets)
+    if patterns:
+        category_matches = np.fromiter(
+            (any(pattern in category for pattern in patterns) for category in categories),
+            dtype=bool,
+            count=len(categories),
+        )
+    else:
+        category_matches = np.ones(len(categories), dtype=bool)
+    # Missing values have code -1, which indexes the trailing False
+    return np.append(category_matches, False)[categorical.cat.codes.to_numpy()]
+
 def normalize_and_filter_jobs(df: pd.DataFrame, settings: Settings) -> pd.DataFrame:
     """
     Normalize and filter a jobs DataFrame according to the provided Settings.
     
-    If df is None or empty, returns an empty DataFrame. Operates on a copy of the input (the original DataFrame is not modified). When present, normalizes 'title', 'location', and 'description' to lowercase, stripped strings. Filters rows whose title matches any entry in settings.JOB_TITLES and whose location matches any entry in settings.JOB_GEOS (case-insensitive substring/contains matching). If a 'compensation' column exists, coerces it to numeric, drops non-numeric rows, and filters to keep only rows with compensation >= settings.MIN_COMPENSATION. Returns the resulting filtered DataFrame.
+    If df is None or empty, returns an empty DataFrame. Operates on a copy of the input (the original DataFrame is not modified). When present, normalizes 'title', 'location', and 'description' to lowercase, stripped strings (Arrow-backed string columns when pyarrow is installed). Filters rows whose title matches any entry in settings.job_titles and whose location matches any entry in settings.job_geos (case-insensitive literal substring matching, evaluated once per distinct title/location). If a 'compensation' column exists, coerces it to numeric, drops non-numeric rows, and filters to keep only rows with compensation >= settings.min_compensation. Returns the resulting filtered DataFrame.
     """
     if df is None or df.empty:
         return pd.DataFrame()
@@ -15,41 +126,48 @@ def normalize_and_filter_jobs(df: pd.DataFrame, settings: Settings) -> pd.DataFr
     filtered_df = df.copy()
 
     # --- Normalization ---
-    # Convert relevant columns to lowercase strings for consistent matching
+    # Convert relevant columns to lowercase strings for consistent matching. All-string columns become
+    # Arrow strings and are normalized by vectorized kernels when pyarrow is available; otherwise one Python
+    # pass per column (non-strings become NaN, as with the .str accessor)
     for col in ['title', 'location', 'description']:
         if col in filtered_df.columns:
-            filtered_df[col] = filtered_df[col].str.lower().str.strip()
+            values = filtered_df[col]
+            if ARROW_STRING_DTYPE is not None and pd.api.types.is_string_dtype(values):
+                filtered_df[col] = values.astype(ARROW_STRING_DTYPE).str.lower().str.strip()
+            else:
+                filtered_df[col] = [
+                    value.lower().strip() if isinstance(value, str) else np.nan
+                    for value in values.to_numpy()
+                ]
 
     # --- Filtering ---
     # 1. Filter by titles
-    target_titles = [t.lower().strip() for t in settings.JOB_TITLES]
-    # The regex `|` acts as an OR
-    title_mask = filtered_df['title'].str.contains('|'.join(target_titles), na=False)
-    filtered_df = filtered_df[title_mask]
-    print(f"Found {len(filtered_df)} jobs after title filter.")
+    target_titles = [t.lower().strip() for t in settings.job_titles]
+    filtered_df = filtered_df[_contains_any(filtered_df['title'], target_titles)]
+    log.info("Found %d jobs after title filter.", len(filtered_df))
 
     # 2. Filter by locations
-    target_geos = [g.lower().strip() for g in settings.JOB_GEOS]
-    geo_mask = filtered_df['location'].str.contains('|'.join(target_geos), na=False)
-    filtered_df = filtered_df[geo_mask]
-    print(f"Found {len(filtered_df)} jobs after location filter.")
+    target_geos = [g.lower().strip() for g in settings.job_geos]
+    filtered_df = filtered_df[_contains_any(filtered_df['location'], target_geos)]
+    log.info("Found %d jobs after location filter.", len(filtered_df))
 
     # 3. Filter by minimum compensation
     if 'compensation' in filtered_df.columns:
-        # Convert compensation to numeric, setting errors to NaN (Not a Number)
-        filtered_df['compensation'] = pd.to_numeric(filtered_df['compensation'], errors='coerce')
-        # Replace NaN values with 'N/A' for consistency
-        filtered_df['compensation'] = filtered_df['compensation'].fillna('N/A')
-        # Apply the filter, only to rows with valid numeric compensation
-        comp_mask = (filtered_df['compensation'] != 'N/A') & (filtered_df['compensation'] >= settings.MIN_COMPENSATION)
-        filtered_df = filtered_df[comp_mask]
-        print(f"Found {len(filtered_df)} jobs after compensation filter.")
-
-    print(f"✅ Filtered down to {len(filtered_df)} jobs matching all criteria.")
-    return filtered_df
+        # Convert compensation to numeric, setting errors to NaN (Not a Number); the column stays numeric
+        compensation = pd.to_numeric(filtered_df['compensation'], errors='coerce')
+        filtered_df['compensation'] = compensation
+        # NaN compares False, so non-numeric rows are dropped by the same comparison. Large frames go
+        # through query(), which pandas evaluates with numexpr (multithreaded) when it is installed.
+        min_compensation = settings.min_compensation
+        if len(filtered_df) >= QUERY_MIN_ROWS:
+            filtered_df = filtered_df.query('compensation >= @min_compensation')
+        else:
+            filtered_df = filtered_df[compensation.to_numpy() >= min_compensation]
+        log.info("Found %d jobs after compensation filter.", len(filtered_df))
 
+    log.info("✅ Filtered down to %d jobs matching all criteria.", len(filtered_df))
+    return filtered_df
 
-import re
 
 def extract_skills_from_resume(resume_text: str) -> List[str]:
     """
@@ -57,62 +175,165 @@ def extract_skills_from_resume(resume_text: str) -> List[str]:
     
     Searches case-insensitively for a top-level "## SKILLS" header and captures text until the next "##" header or end of document. From that section, it extracts lines starting with a dash ('-') as bullet items, splits comma-separated items on the same line, strips surrounding whitespace, and lowercases each skill. Returns an empty list if no SKILLS section is found.
     
+    The resume rarely changes between runs, so results are cached per resume text; each call returns a new list.
+    
     Returns:
         List[str]: A list of skill strings in lowercase with empty entries removed.
     """
-    # Regex to find the content between "## SKILLS" and the next "##" section
-    skills_section_match = re.search(r"##\s*SKILLS\s*\n(.*?)(?=\n##|$)", resume_text, re.DOTALL | re.IGNORECASE)
+    return list(_extract_skills(resume_text))
+
+
+# The "## SKILLS" section of a resume (up to the next "##" header), and the bullet items within it
+_SKILLS_SECTION_RE = re.compile(r"##\s*SKILLS\s*\n(.*?)(?=\n##|$)", re.DOTALL | re.IGNORECASE)
+_SKILL_BULLET_RE = re.compile(r"-\s*(.*)")
+
+
+@functools.lru_cache(maxsize=8)
+def _extract_skills(resume_text: str) -> Tuple[str, ...]:
+    """Parse the skills of resume_text for extract_skills_from_resume, as an immutable tuple safe to cache."""
+    skills_section_match = _SKILLS_SECTION_RE.search(resume_text)
     if not skills_section_match:
-        return []
+        return ()
+
+    # Split each bullet on commas and strip the pieces in one pass, dropping empty entries
+    return tuple(
+        skill
+        for bullet in _SKILL_BULLET_RE.findall(skills_section_match.group(1))
+        for skill in (part.strip() for part in bullet.lower().split(','))
+        if skill
+    )
+
+
+# Words of a description, and skills consisting only of words separated by single spaces
+_WORD_RE = re.compile(r"\w+")
+_WORD_PHRASE_RE = re.compile(r"\w+(?: \w+)*")
+
+
+def _is_word_char(char: str) -> bool:
+    """Return whether char counts as a word character for regex \\b purposes."""
+    return char.isalnum() or char == '_'
+
+
+def _at_word_boundary(text: str, pos: int) -> bool:
+    """Return whether a regex \\b would match at index pos of text."""
+    before = pos > 0 and _is_word_char(text[pos - 1])
+    after = pos < len(text) and _is_word_char(text[pos])
+    return before != after
+
+
+def _skill_counter(skills: List[str]) -> Callable[[str], int]:
+    """
+    Build a function that counts the distinct skills occurring as whole words in a lowercased description.
+    
+    Skills from extract_skills_from_resume are lowercase, so matching is plain case-sensitive comparison.
+    
+    With pyahocorasick installed, all skills are compiled into one Aho-Corasick automaton, so each description
+    is scanned once in linear time regardless of the number of skills; matches are kept only if they start and
+    end on word boundaries (the same rule as regex \\b).
+    
+    Without it, skills made only of words separated by single spaces are indexed by their first word, in the
+    style of FlashText: the description's words are walked once and each costs a single dict lookup, however
+    many skills there are. Any other skills (e.g. "c++", "node.js") are few, and each is searched for with its
+    own whole-word regex, so skills overlapping at the same position all count, as they do in the automaton.
+    """
+    if ahocorasick is not None:
+        automaton = ahocorasick.Automaton()
+        for skill in skills:
+            automaton.add_word(skill, skill)
+        automaton.make_automaton()
 
-    skills_content = skills_section_match.group(1)
+        def count(text: str) -> int:
+            found_skills = set()
+            for end, skill in automaton.iter(text):
+                start = end - len(skill) + 1
+                if _at_word_boundary(text, start) and _at_word_boundary(text, end + 1):
+                    found_skills.add(skill)
+            return len(found_skills)
 
-    # Extract individual skills from bullet points
-    skills = [skill.strip().lower() for skill in re.findall(r"-\s*(.*)", skills_content)]
+        return count
 
-    # Further split if skills are comma-separated on the same line
-    final_skills = []
+    phrases_by_first_word: Dict[str, List[str]] = {}
+    other_skills = []
     for skill in skills:
-        final_skills.extend([s.strip() for s in skill.split(',')])
+        if _WORD_PHRASE_RE.fullmatch(skill):
+            phrases_by_first_word.setdefault(skill.split(' ', 1)[0], []).append(skill)
+        else:
+            other_skills.append(skill)
+
+    # Whole-word regexes for the remaining skills, compiled once per scoring run (case-sensitive, like the rest).
+    # One per skill rather than a single alternation, which would report only one of two skills matching at
+    # the same position (e.g. "c++" and "c++/cli")
+    other_patterns = [(skill, re.compile(r'\b' + re.escape(skill) + r'\b')) for skill in other_skills]
+
+    def count(text: str) -> int:
+        found_skills = set()
+        for word in _WORD_RE.finditer(text):
+            start = word.start()
+            for phrase in phrases_by_first_word.get(word.group(), ()):
+                end = start + len(phrase)
+                if text.startswith(phrase, start) and not (end < len(text) and _is_word_char(text[end])):
+                    found_skills.add(phrase)
+        found_skills.update(skill for skill, pattern in other_patterns if pattern.search(text))
+        return len(found_skills)
 
-    return list(filter(None, final_skills))
+    return count
+
+
+def _score_descriptions(skills: List[str], descriptions) -> List[int]:
+    """
+    Score each lowercased description by its number of distinct skills (0 for non-strings).
+    
+    Module-level so it can run in worker processes; each call builds its own matcher from skills.
+    """
+    count_skills = _skill_counter(skills)
+    # A plain comprehension over the array avoids pandas' per-row .apply dispatch
+    return [
+        count_skills(description) if isinstance(description, str) else 0
+        for description in descriptions
+    ]
 
 
 def score_jobs(df: pd.DataFrame, resume_text: str) -> pd.DataFrame:
     """
     Score each job by the number of unique skills from a resume that appear in the job description.
     
-    If df is empty, it is returned unchanged. Resume skills are extracted with extract_skills_from_resume(resume_text); if no skills are found, a 'score' column with 0 is added to df and df is returned. Matching uses whole-word, case-insensitive regexes built from the extracted skills; each unique matched skill contributes 1 to the score. The returned DataFrame contains a new 'score' column and is sorted by 'score' in descending order.
+    If df is empty, it is returned unchanged. Resume skills are extracted with extract_skills_from_resume(resume_text); if no skills are found, a 'score' column with 0 is added to df and df is returned. Matching is whole-word (see _skill_counter) and expects descriptions already lowercased, as normalize_and_filter_jobs leaves them, so no per-row case folding is done; each unique matched skill contributes 1 to the score, and descriptions that are not strings score 0. Each distinct description is scored once, however many rows share it, and PARALLEL_SCORING_MIN_ROWS or more distinct descriptions are scored in parallel across CPU cores. The returned DataFrame contains a new 'score' column and is sorted by 'score' in descending order, with ties kept in input order.
     """
     if df.empty:
         return df
 
     skills = extract_skills_from_resume(resume_text)
     if not skills:
-        print("⚠️ Warning: Could not find skills in resume. All job scores will be 0.")
+        log.warning("⚠️ Could not find skills in resume. All job scores will be 0.")
         df['score'] = 0
         return df
 
-    print(f"Scoring based on {len(skills)} skills: {skills}")
-
-    # Create a regex pattern to find any of the skills (as whole words)
-    # This avoids matching "ai" in "strait"
-    skills_pattern = r'\b(' + '|'.join(re.escape(skill.strip()) for skill in skills) + r')\b'
-
-    def calculate_score(description: str) -> int:
-        """
-        Count unique resume skills found in a job description.
-        
-        Returns the number of distinct skill matches (using the outer-scope `skills_pattern` regex) found in the provided job description text. Matching is case-insensitive and counts each skill at most once. If `description` is not a string, returns 0.
-        """
-        if not isinstance(description, str):
-            return 0
-        # Find all unique matches to avoid over-counting a single skill
-        found_skills = set(re.findall(skills_pattern, description.lower(), re.IGNORECASE))
-        return len(found_skills)
+    log.info("Scoring based on %d skills: %s", len(skills), skills)
 
-    scored_df = df.copy()
-    scored_df['score'] = scored_df['description'].apply(calculate_score)
+    # Duplicate listings share a description, so each distinct description is scored once and the scores are
+    # broadcast back to rows through the factorized codes
+    codes, uniques = pd.factorize(df['description'])
+    descriptions = np.asarray(uniques, dtype=object)
+    workers = os.cpu_count() or 1
+    if len(descriptions) >= PARALLEL_SCORING_MIN_ROWS and workers > 1:
+        # Matching is CPU-bound pure Python, so fan contiguous chunks out to one process per core. Workers
+        # come from a forkserver: by now pyarrow has started threads, and forking a multi-threaded process
+        # can deadlock the child on locks those threads held
+        chunks = np.array_split(descriptions, workers)
+        mp_context = multiprocessing.get_context("forkserver")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=mp_context) as executor:
+            scores = [
+                score
+                for chunk_scores in executor.map(_score_descriptions, repeat(skills), chunks)
+                for score in chunk_scores
+            ]
+    else:
+        scores = _score_descriptions(skills, descriptions)
+    # Missing descriptions have code -1, which indexes the trailing 0
+    scores = np.append(np.asarray(scores, dtype=np.int64), 0)[codes]
 
-    print("✅ Scored jobs based on resume keywords.")
-    return scored_df.sort_values(by='score', ascending=False)
+    log.info("✅ Scored jobs based on resume keywords.")
+    # Sort only the integer score array (stable, so ties keep their input order) and reorder the rows once;
+    # assign() shares the column data of the reordered frame rather than copying it again
+    order = np.argsort(-scores, kind='stable')
+    return df.take(order).assign(score=scores[order])
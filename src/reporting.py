@@ -1,54 +1,88 @@
+import functools
+import logging
 import pandas as pd
-from jinja2 import Environment, FileSystemLoader
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, Template, TemplateNotFound
 from datetime import datetime
-import os
-from typing import Dict, Any, Optional
+from pathlib import Path
+from typing import Dict, Any, Optional, Tuple
+from src.file_io import ensure_dir, open_atomic, write_text_atomic
 
-def generate_html_report(summary_data: Dict[str, Any], applications_df: pd.DataFrame) -> Optional[str]:
+log = logging.getLogger(__name__)
+
+REPORTS_DIR = Path("reports")
+
+@functools.lru_cache(maxsize=1)
+def _report_template() -> Template:
+    """
+    Load and compile templates/report_template.html once per process.
+    
+    Raises TemplateNotFound if it is missing; failures are not cached, so a later call tries again.
+    
+    The environment never re-checks the template for changes, and compiled bytecode is also cached on disk
+    so new processes skip compilation too.
+    """
+    env = Environment(
+        loader=FileSystemLoader('templates'),
+        auto_reload=False,
+        bytecode_cache=FileSystemBytecodeCache(),
+    )
+    return env.get_template('report_template.html')
+
+def generate_html_report(
+    summary_data: Dict[str, Any],
+    applications_df: pd.DataFrame,
+    keep_html: bool = True,
+) -> Tuple[Optional[str], Optional[str]]:
     """
     Generate an HTML report from summary statistics and an applications DataFrame.
     
     Renders the Jinja2 template located at `templates/report_template.html` using a context that includes:
     - `generation_date` (current timestamp),
     - `summary` (the provided summary_data),
-    - `applications` (applications_df converted to a list of record dicts, or an empty list if the DataFrame is empty).
+    - `applications` (applications_df rows as a list of `Application` namedtuples, empty if the DataFrame is empty).
+    
+    If the template cannot be found or writing the output file fails, the function returns (None, None). On success it atomically replaces `reports/daily_report.html` with the rendered HTML (creating the `reports` directory if needed) and returns the path together with the HTML itself, so callers such as the email step need not read the file back.
     
-    If the `templates` directory is missing or writing the output file fails, the function returns None. On success it writes the rendered HTML to `reports/daily_report.html` (creating the `reports` directory if needed) and returns the path to the generated file.
+    When the caller does not need the HTML (keep_html=False), the template is instead streamed chunk by chunk straight into the file, so the full document is never held in memory, and None is returned in its place.
     
     Parameters:
         summary_data: Summary statistics and values to expose to the template.
         applications_df: DataFrame of applications processed in this run; converted to template-friendly records.
+        keep_html: Whether to return the rendered HTML (default: True). If False, it is streamed to disk only.
     
     Returns:
-        The filesystem path to the generated HTML report (str), or None if generation failed.
+        A (report_path, html_content) tuple, with html_content None when keep_html is False, or (None, None) if generation failed.
     """
-    if not os.path.exists('templates'):
-        print("❌ Error: 'templates' directory not found.")
-        return None
-
-    env = Environment(loader=FileSystemLoader('templates'))
-    template = env.get_template('report_template.html')
+    # Both the template and the reports directory are set up on the first call only; later calls reuse them
+    # without touching the filesystem
+    try:
+        template = _report_template()
+    except TemplateNotFound as e:
+        log.error("❌ Report template not found: %s", e)
+        return None, None
 
     # Prepare data for the template
     report_data = {
         "generation_date": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
         "summary": summary_data,
-        "applications": applications_df.to_dict(orient='records') if not applications_df.empty else []
+        # Lightweight namedtuples (one shared class) rather than one dict per row; the template reads
+        # fields as attributes either way, and needs a list for its `{% if applications %}` check
+        "applications": list(applications_df.itertuples(index=False, name='Application')),
     }
 
-    # Render the HTML
-    html_content = template.render(report_data)
-
     # Save the report
-    output_dir = "reports"
-    os.makedirs(output_dir, exist_ok=True)
-    report_path = os.path.join(output_dir, "daily_report.html")
+    report_path = str(ensure_dir(REPORTS_DIR) / "daily_report.html")
 
     try:
-        with open(report_path, 'w', encoding='utf-8') as f:
-            f.write(html_content)
-        print(f"✅ HTML report successfully generated at {report_path}")
-        return report_path
+        if keep_html:
+            html_content = template.render(report_data)
+            write_text_atomic(report_path, html_content)
+        else:
+            html_content = None
+            with open_atomic(report_path) as f:
+                template.stream(report_data).dump(f, encoding='utf-8')
+        log.info("✅ HTML report successfully generated at %s", report_path)
+        return report_path, html_content
     except Exception as e:
-        print(f"❌ Error writing HTML report: {e}")
-        return None
+        log.error("❌ Error writing HTML report: %s", e)
+        return None, None
@@ -0,0 +1,125 @@
+"""Tests for resume generation in src.generation."""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from src import generation, llm_cache
+
+
+class FakeAsyncStream:
+    """Stand-in for ``openai.AsyncStream`` yielding ``content`` in chunks."""
+
+    def __init__(self, content, chunk_size=8):
+        self.content = content
+        self.chunk_size = chunk_size
+        self.response = FakeStreamResponse()
+
+    async def __aiter__(self):
+        for start in range(0, len(self.content), self.chunk_size):
+            delta = SimpleNamespace(content=self.content[start:start + self.chunk_size])
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=delta)])
+
+
+class FakeStreamResponse:
+    """HTTP response of a FakeAsyncStream; records whether it was closed."""
+
+    def __init__(self):
+        self.closed = False
+
+    async def aclose(self):
+        self.closed = True
+
+
+class FakeAsyncOpenAI:
+    """
+    Stand-in for ``openai.AsyncOpenAI``: non-streamed completions return ``content`` with ``finish_reason``,
+    streamed ones a resume. Every request is recorded in ``calls``.
+    """
+
+    def __init__(self, content, finish_reason="stop"):
+        self.content = content
+        self.finish_reason = finish_reason
+        self.calls = []
+        self.streams = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    async def _create(self, **kwargs):
+        self.calls.append(kwargs)
+        if kwargs.get("stream"):
+            stream = FakeAsyncStream("# Tailored resume\n")
+            self.streams.append(stream)
+            return stream
+        message = SimpleNamespace(content=self.content)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message, finish_reason=self.finish_reason)])
+
+
+@pytest.fixture(autouse=True)
+def isolated_output(tmp_path, monkeypatch):
+    """Write resume variants under tmp_path and bypass the on-disk LLM cache."""
+    monkeypatch.setattr(generation, "RESUME_VARIANTS_DIR", tmp_path / "resume_variants")
+    monkeypatch.setattr(llm_cache, "get", lambda key: None)
+    monkeypatch.setattr(llm_cache, "put", lambda key, model, value: None)
+
+
+JOBS = [
+    {"company": "Acme", "title": "Product Manager", "description": "ai product"},
+    {"company": "Globex", "title": "Architect", "description": "python"},
+]
+
+
+class TestGenerateResumeVariantsBatch:
+    """Tests for generate_resume_variants_batch."""
+
+    @pytest.mark.parametrize("content,finish_reason", [
+        (None, "content_filter"),
+        ('{"resumes": [{"id": 0, "markdown": "# Cut', "length"),
+    ])
+    def test_unusable_batch_falls_back_to_single_jobs(self, content, finish_reason):
+        """Test that a batch without usable text is regenerated one job at a time."""
+        client = FakeAsyncOpenAI(content, finish_reason)
+
+        paths = asyncio.run(generation.generate_resume_variants_batch(client, "# Resume", JOBS))
+
+        assert all(path is not None for path in paths)
+        for path in paths:
+            with open(path, encoding="utf-8") as f:
+                assert f.read() == "# Tailored resume\n"
+        assert [bool(call.get("stream")) for call in client.calls] == [False, True, True]
+
+
+class TestGenerateResumeVariant:
+    """Tests for generate_resume_variant."""
+
+    def test_streamed_resume_is_saved_and_stream_closed(self):
+        """Test that the streamed resume is written to its file and the stream's response closed."""
+        client = FakeAsyncOpenAI(None)
+
+        path = asyncio.run(generation.generate_resume_variant(client, "# Resume", JOBS[0]))
+
+        with open(path, encoding="utf-8") as f:
+            assert f.read() == "# Tailored resume\n"
+        assert client.streams[0].response.closed
+
+    def test_stream_closed_when_writing_fails(self, monkeypatch):
+        """Test that the stream's response is closed when writing the resume fails partway."""
+        client = FakeAsyncOpenAI(None)
+        monkeypatch.setattr(generation, "STREAM_WRITE_THRESHOLD", 1)
+
+        class FailingFile:
+            async def write(self, data):
+                raise OSError("disk full")
+
+        class FailingOpen:
+            async def __aenter__(self):
+                return FailingFile()
+
+            async def __aexit__(self, *exc_info):
+                return False
+
+        monkeypatch.setattr(generation, "open_atomic_async", lambda filepath: FailingOpen())
+
+        path = asyncio.run(generation.generate_resume_variant(client, "# Resume", JOBS[0]))
+
+        assert path is None
+        assert client.streams[0].response.closed
@@ -0,0 +1,84 @@
+"""Tests for job scoring in src.processing."""
+import random
+
+import pytest
+
+from src import processing
+
+
+SKILLS = ["ai", "ai product", "python", "c++", "asp.net", "asp.net core", "node.js", "node", "é-commerce", "machine learning"]
+
+# (lowercased description, expected score)
+DESCRIPTIONS = [
+    ("we need python and ai", 2),
+    ("lead the ai product roadmap", 2),  # "ai" and "ai product" overlap at the same position
+    ("asp.net core services", 2),  # "asp.net" and "asp.net core" overlap at the same position
+    ("asp.net, asp.netx", 1),
+    ("c++x", 1),  # \b after "++" needs a word character next, as with regex
+    ("c++ and c++.", 0),
+    ("strait pythonic nodes", 0),  # skills must be whole words
+    ("node.js or node", 2),
+    ("node.jsx", 1),  # "node" still ends on a boundary
+    ("é-commerce platform", 1),
+    ("machine  learning", 0),  # phrases match single spaces only
+    ("machine learning_ops, machine learning", 1),
+    ("", 0),
+]
+
+
+@pytest.fixture(params=["ahocorasick", "word_index"])
+def backend(request, monkeypatch):
+    """Select a _skill_counter backend: the Aho-Corasick automaton or the first-word index fallback."""
+    if request.param == "ahocorasick":
+        pytest.importorskip("ahocorasick")
+    else:
+        monkeypatch.setattr(processing, "ahocorasick", None)
+    return request.param
+
+
+class TestSkillCounter:
+    """Tests for _skill_counter."""
+
+    @pytest.mark.parametrize("description,expected", DESCRIPTIONS)
+    def test_counts_distinct_whole_word_skills(self, backend, description, expected):
+        """Test that each backend scores the fixed descriptions as expected."""
+        count_skills = processing._skill_counter(SKILLS)
+
+        assert count_skills(description) == expected
+
+    def test_backends_agree_on_random_texts(self, monkeypatch):
+        """Test that the automaton and the fallback give identical scores."""
+        pytest.importorskip("ahocorasick")
+        rng = random.Random(0)
+        pieces = ["ai", "product", "python", "c++", "asp.net", "core", "node", ".js", "é-commerce", "machine", "learning", "x", "_"]
+        separators = [" ", "", ", ", "-", ".", "  "]
+        texts = [
+            "".join(rng.choice(pieces) + rng.choice(separators) for _ in range(rng.randint(1, 12)))
+            for _ in range(2000)
+        ]
+
+        automaton_scores = [processing._skill_counter(SKILLS)(text) for text in texts]
+        monkeypatch.setattr(processing, "ahocorasick", None)
+        fallback_scores = [processing._skill_counter(SKILLS)(text) for text in texts]
+
+        assert fallback_scores == automaton_scores
+
+
+class TestScoreJobs:
+    """Tests for score_jobs."""
+
+    def test_scores_and_sorts_jobs(self):
+        """Test that jobs are scored once per description and sorted stably by score."""
+        import pandas as pd
+
+        resume = "# Resume\n\n## SKILLS\n- Python, AI Product\n- C++\n\n## EXPERIENCE\n- none\n"
+        df = pd.DataFrame(
+            {"description": ["python", None, "ai product in python", "python", "nothing"]},
+            index=[10, 11, 12, 13, 14],
+        )
+
+        scored = processing.score_jobs(df, resume)
+
+        assert scored.index.tolist() == [12, 10, 13, 11, 14]
+        assert scored["score"].tolist() == [2, 1, 1, 0, 0]
+        assert "score" not in df.columns